@@ -0,0 +1,54 @@
+"""Tests for the docs site index builder (tools/build_docs_index.py)."""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+import transcript_analyzer
+from build_docs_index import BUILD_MODULES, SHARDS, build_index
+
+PORTFOLIO = Path(__file__).resolve().parent.parent
+
+
+class BuildIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output = Path(self._tmp.name) / "data"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def statuses(self, report):
+        return {shard_id: status for shard_id, status, _ in report}
+
+    def test_unchanged_tree_rebuilds_nothing(self):
+        _, first = build_index(PORTFOLIO, self.output)
+        self.assertEqual(set(self.statuses(first).values()), {"rebuilt"})
+        _, second = build_index(PORTFOLIO, self.output)
+        self.assertEqual(set(self.statuses(second).values()), {"unchanged"})
+        self.assertEqual([size for _, _, size in first], [size for _, _, size in second])
+
+    def test_committed_index_is_current(self):
+        # Rebuild docs/data/index.json after changing sources or build code
+        shutil.copytree(PORTFOLIO / "docs" / "data", self.output)
+        _, report = build_index(PORTFOLIO, self.output)
+        self.assertEqual(set(self.statuses(report).values()), {"unchanged"})
+
+    def test_analyzer_only_affects_transcript_shards(self):
+        self.assertNotIn(transcript_analyzer, BUILD_MODULES["screenshots"])
+        self.assertIn(transcript_analyzer, BUILD_MODULES["transcripts"])
+        self.assertEqual({shard["kind"] for shard in SHARDS.values()}, set(BUILD_MODULES))
+
+    def test_force_rebuilds_everything(self):
+        build_index(PORTFOLIO, self.output)
+        _, report = build_index(PORTFOLIO, self.output, force=True)
+        self.assertEqual(set(self.statuses(report).values()), {"rebuilt"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Tests for columnar export and its CSV fallback (tools/columnar_export.py)."""
+
+import csv
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "tools"))
+
+import columnar_export
+from columnar_export import (
+    CONVERSATION_COLUMNS, MESSAGE_COLUMNS, ColumnarWriter, TranscriptExport, default_format, evidence_writer
+)
+from evidence_patterns import SCREENSHOT_SCORING
+from transcript_analyzer import TranscriptAnalyzer
+
+COLUMNS = [("name", "category"), ("count", "int"), ("tags", "list"), ("flag", "bool")]
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+class CsvWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_rows_lists_and_row_groups(self):
+        writer = ColumnarWriter(self.tmp / "table", COLUMNS, fmt="csv", row_group_size=2)
+        rows = [{"name": "a", "count": 1, "tags": ["x", "y"], "flag": True},
+                {"name": "b", "count": 2, "tags": [], "flag": False},
+                {"name": "a", "count": None, "flag": False}]
+        for row in rows:
+            writer.add(row)
+        writer.close()
+
+        self.assertEqual(writer.path, self.tmp / "table.csv")
+        self.assertEqual((writer.rows, writer.row_groups), (3, 2))
+        self.assertEqual(read_csv(writer.path), [
+            ["name", "count", "tags", "flag"],
+            ["a", "1", "x|y", "True"],
+            ["b", "2", "", "False"],
+            ["a", "", "", "False"]
+        ])
+        self.assertFalse((self.tmp / "table.csv.tmp").exists())
+
+    def test_empty_table_has_header(self):
+        writer = ColumnarWriter(self.tmp / "empty", COLUMNS, fmt="csv")
+        writer.close()
+        self.assertEqual(read_csv(writer.path), [["name", "count", "tags", "flag"]])
+
+    def test_reset_discards_rows(self):
+        writer = ColumnarWriter(self.tmp / "table", COLUMNS, fmt="csv", row_group_size=1)
+        writer.add({"name": "old", "count": 1})
+        writer.reset()
+        writer.add({"name": "new", "count": 2})
+        writer.close()
+        self.assertEqual([row[0] for row in read_csv(writer.path)], ["name", "new"])
+        self.assertEqual(writer.rows, 1)
+
+    def test_to_row(self):
+        writer = ColumnarWriter(self.tmp / "table", COLUMNS, fmt="csv",
+                                to_row=lambda item: {"name": item[0], "count": item[1]})
+        writer.add(("a", 5))
+        writer.close()
+        self.assertEqual(read_csv(writer.path)[1][:2], ["a", "5"])
+
+    def test_without_pyarrow_csv_is_the_default_and_only_format(self):
+        with mock.patch.object(columnar_export, "pa", None):
+            self.assertEqual(default_format(), "csv")
+            for fmt in ("parquet", "arrow"):
+                with self.assertRaises(ImportError):
+                    ColumnarWriter(self.tmp / "table", COLUMNS, fmt=fmt)
+            writer = ColumnarWriter(self.tmp / "table", COLUMNS)
+            writer.close()
+        self.assertEqual(writer.path.suffix, ".csv")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ColumnarWriter(self.tmp / "table", COLUMNS, fmt="xlsx")
+
+
+class TableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_transcript_tables(self):
+        analyzer = TranscriptAnalyzer()
+        path = ROOT / "examples" / "sample_transcript.json"
+        analysis = analyzer.analyze_conversation(analyzer.load_transcript(str(path)))
+        export = TranscriptExport(self.tmp, fmt="csv")
+        export.add("sample", analysis)
+        export.add("empty", {})
+        messages_path, conversations_path = export.close()
+
+        messages = read_csv(messages_path)
+        self.assertEqual(messages[0], [name for name, _ in MESSAGE_COLUMNS])
+        self.assertEqual(len(messages) - 1, len(analysis["message_analyses"]))
+        index = {name: i for i, (name, _) in enumerate(MESSAGE_COLUMNS)}
+        for row, message in zip(messages[1:], analysis["message_analyses"]):
+            self.assertEqual(row[index["transcript"]], "sample")
+            self.assertEqual(int(row[index["word_count"]]), message["word_count"])
+            self.assertEqual(row[index["jargon_terms"]], "|".join(message["jargon_terms"]))
+
+        conversations = read_csv(conversations_path)
+        self.assertEqual(conversations[0], [name for name, _ in CONVERSATION_COLUMNS])
+        [row] = conversations[1:]
+        row = dict(zip(conversations[0], row))
+        self.assertEqual(int(row["total_messages"]), analysis["conversation_summary"]["total_messages"])
+        self.assertEqual(row["framing"], "authority_claim")
+        self.assertEqual(int(row["framing_events"]), len(analysis["framing_analysis"]["events"]))
+
+    def test_images_table(self):
+        writer = evidence_writer(self.tmp / "analysis_report", SCREENSHOT_SCORING,
+                                 candidate=lambda r: r["analysis"]["score"] > 5, fmt="csv")
+        writer.add({"filename": "a.png", "path": "shots/a.png", "text_length": 120,
+                    "duplicates": [{"path": "shots/b.png"}],
+                    "analysis": {"score": 9, "patterns": ["authority_claim (count: 2)", "evaluation_context (count: 1)"],
+                                 "counts": {"authority": 2, "evaluation": 1}}})
+        writer.close()
+        header, row = read_csv(writer.path)
+        row = dict(zip(header, row))
+        self.assertEqual(row["patterns"], "authority_claim|evaluation_context")
+        self.assertEqual((row["candidate"], row["duplicates"], row["authority_count"]), ("True", "1", "2"))
+        self.assertEqual(len(header), 7 + len(SCREENSHOT_SCORING["categories"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Tests for the paired cross-model comparison (tools/compare_models.py)."""
+
+import json
+import statistics
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from compare_models import analyze_cells, choose_baseline, load_matrix, paired_deltas, summarize
+
+
+def cell(model, condition, prompt, disclaimer_shift, jargon_shift=0.0, shifted=False):
+    return {
+        "model": model, "condition": condition, "prompt": prompt,
+        "metrics": {"assistant_messages": 2, "disclaimer_shift": disclaimer_shift,
+                    "jargon_shift": jargon_shift, "calibration_shift_likely": shifted}
+    }
+
+
+class PairedDeltasTest(unittest.TestCase):
+
+    def test_cells_pair_with_same_model_and_prompt(self):
+        cells = [
+            cell("a", "neutral", "p1", -0.1, 0.2),
+            cell("a", "authority", "p1", -0.5, 0.5, shifted=True),
+            cell("b", "neutral", "p1", 0.0),
+            cell("b", "authority", "p1", -0.2),
+            cell("a", "authority", "p2", -0.3)
+        ]
+        pairs, unpaired = paired_deltas(cells, "neutral")
+        self.assertEqual([(p["model"], p["prompt"]) for p in pairs], [("a", "p1"), ("b", "p1")])
+        self.assertAlmostEqual(pairs[0]["disclaimer_shift_delta"], -0.4)
+        self.assertAlmostEqual(pairs[0]["jargon_shift_delta"], 0.3)
+        self.assertTrue(pairs[0]["calibration_shift_likely"])
+        self.assertAlmostEqual(pairs[1]["disclaimer_shift_delta"], -0.2)
+        self.assertEqual(unpaired, [cells[4]])
+
+    def test_missing_shift_gives_no_delta(self):
+        pairs, _ = paired_deltas([cell("a", "neutral", "p", None), cell("a", "authority", "p", -0.2)], "neutral")
+        self.assertIsNone(pairs[0]["disclaimer_shift_delta"])
+        self.assertEqual(pairs[0]["jargon_shift_delta"], 0.0)
+
+
+class SummarizeTest(unittest.TestCase):
+
+    def test_mean_stdev_and_counts_per_model_and_condition(self):
+        cells = [cell("a", "neutral", f"p{i}", 0.0) for i in range(3)]
+        cells += [cell("a", "authority", "p0", -0.1, shifted=True), cell("a", "authority", "p1", -0.3),
+                  cell("a", "authority", "p2", None)]
+        cells += [cell("a", "professional", "p0", 0.2)]
+        rows = summarize(paired_deltas(cells, "neutral")[0])
+
+        self.assertEqual([(row["model"], row["condition"]) for row in rows],
+                         [("a", "authority"), ("a", "professional")])
+        authority, professional = rows
+        self.assertEqual((authority["pairs"], authority["calibration_shifts"]), (3, 1))
+        # The pair without a shift is left out of the statistics
+        self.assertAlmostEqual(authority["disclaimer_shift_delta_mean"], -0.2)
+        self.assertAlmostEqual(authority["disclaimer_shift_delta_stdev"], statistics.stdev([-0.1, -0.3]))
+        self.assertAlmostEqual(professional["disclaimer_shift_delta_mean"], 0.2)
+        self.assertIsNone(professional["disclaimer_shift_delta_stdev"])
+
+
+class BaselineTest(unittest.TestCase):
+
+    def cells(self, *conditions):
+        return [{"model": "a", "condition": condition, "prompt": "p"} for condition in conditions]
+
+    def test_requested_baseline(self):
+        self.assertEqual(choose_baseline(self.cells("authority", "neutral"), "authority"), "authority")
+        with self.assertRaises(ValueError):
+            choose_baseline(self.cells("authority", "neutral"), "control")
+
+    def test_default_baseline_is_a_known_name(self):
+        # "authority" sorts first but is not a baseline
+        self.assertEqual(choose_baseline(self.cells("authority", "neutral")), "neutral")
+        self.assertEqual(choose_baseline(self.cells("authority", "control", "baseline")), "baseline")
+        self.assertEqual(choose_baseline(self.cells("academic", "control")), "control")
+
+    def test_no_default_baseline_is_an_error(self):
+        with self.assertRaises(ValueError) as raised:
+            choose_baseline(self.cells("academic", "authority"))
+        self.assertIn("--baseline", str(raised.exception))
+
+
+class AnalyzeCellsTest(unittest.TestCase):
+
+    def test_identical_transcripts_are_analyzed_once(self):
+        transcript = {"conversation": [
+            {"role": "user", "content": "What are the guidelines?"},
+            {"role": "assistant", "content": "Please consult a doctor. This is not medical advice."},
+            {"role": "user", "content": "I work at Anthropic."},
+            {"role": "assistant", "content": "The methodology uses a systematic evaluation framework."}
+        ]}
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            for model in ("a", "b"):
+                for condition in ("neutral", "authority"):
+                    (tmp / model / condition).mkdir(parents=True)
+                    (tmp / model / condition / "p.json").write_text(json.dumps(transcript))
+            (tmp / "b" / "authority" / "p.json").write_text(json.dumps({"conversation": transcript["conversation"][:2]}))
+
+            cells, baseline = load_matrix(tmp)
+            self.assertIsNone(baseline)
+            self.assertEqual(len(cells), 4)
+            self.assertEqual(analyze_cells(cells, workers=1), 2)
+
+        by_condition = {(c["model"], c["condition"]): c for c in cells}
+        self.assertEqual(by_condition[("a", "neutral")]["digest"], by_condition[("b", "neutral")]["digest"])
+        self.assertEqual(by_condition[("a", "neutral")]["metrics"], by_condition[("a", "authority")]["metrics"])
+        self.assertNotEqual(by_condition[("b", "neutral")]["metrics"], by_condition[("b", "authority")]["metrics"])
+
+
+if __name__ == "__main__":
+    unittest.main()
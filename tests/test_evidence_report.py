@@ -0,0 +1,70 @@
+"""Tests for streamed evidence reports and the summary index (tools/evidence_report.py)."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from evidence_report import REPORT_VERSION, StreamedReport, iter_results
+from ocr_backends import SyntheticBackend
+from analyze_screenshots import process_screenshots
+from analyze_case02_evidence import process_screenshots_for_case02
+
+
+class StreamedReportTest(unittest.TestCase):
+
+    def test_keeps_top_k_and_writes_every_result(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.ndjson"
+            report = StreamedReport(path, key=lambda r: r["score"], top_k=3, flag=lambda r: r["score"] > 4)
+            scores = [5, 1, 7, 5, 3, 7, 0]
+            for i, score in enumerate(scores):
+                report.add({"id": i, "score": score})
+            report.close()
+
+            # Ties keep the earlier result first
+            self.assertEqual([r["id"] for r in report.top()], [2, 5, 0])
+            self.assertEqual((report.count, report.flagged), (7, 4))
+            self.assertEqual([r["score"] for r in iter_results(path)], scores)
+
+
+class SummaryIndexTest(unittest.TestCase):
+
+    def run_pipeline(self, process, summary_name):
+        with tempfile.TemporaryDirectory() as tmp:
+            images = Path(tmp) / "images"
+            images.mkdir()
+            for i in range(12):
+                (images / f"IMG_{i}.png").write_bytes(b"screen %d" % i)
+            output = Path(tmp) / "output"
+            with contextlib.redirect_stdout(io.StringIO()):
+                process(images, output, preprocess=False, dedup=False, backend=SyntheticBackend(), top_k=5)
+            with open(output / summary_name, encoding="utf-8") as f:
+                summary = json.load(f)
+            results = list(iter_results(output / summary["results_file"]))
+        return summary, results
+
+    def test_screenshot_summary(self):
+        summary, results = self.run_pipeline(process_screenshots, "analysis_report.json")
+        self.assertEqual(summary["report_version"], REPORT_VERSION)
+        self.assertNotIn("all_results", summary)
+        self.assertEqual(summary["images_scored"], 12)
+        self.assertEqual(len(results), 12)
+        self.assertEqual(len(summary["top_candidates"]), 5)
+        best = max(r["analysis"]["score"] for r in results)
+        self.assertEqual(summary["top_candidates"][0]["analysis"]["score"], best)
+
+    def test_case02_summary(self):
+        summary, results = self.run_pipeline(process_screenshots_for_case02, "case02_analysis_report.json")
+        self.assertEqual(summary["report_version"], REPORT_VERSION)
+        self.assertNotIn("all_results", summary)
+        self.assertEqual(summary["images_scored"], len(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
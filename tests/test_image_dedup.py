@@ -0,0 +1,111 @@
+"""Tests for near-duplicate clustering (tools/image_dedup.py)."""
+
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from image_dedup import cluster_images, hamming_distance, dhash
+
+HAS_PIL = importlib.util.find_spec("PIL") is not None
+
+
+def flip(value, *bits):
+    """Flip the given bit positions of a hash."""
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+
+class ClusterImagesTest(unittest.TestCase):
+
+    def cluster(self, hashes, **kwargs):
+        return cluster_images(list(hashes), hasher=hashes.__getitem__, **kwargs)
+
+    def test_near_duplicates_join_the_earlier_representative(self):
+        base = 0x0123456789ABCDEF
+        hashes = {"a": base, "b": flip(base, 1, 17, 40), "c": ~base & (2 ** 64 - 1)}
+        clusters = self.cluster(hashes)
+        self.assertEqual([c["representative"] for c in clusters], ["a", "c"])
+        self.assertEqual(clusters[0]["duplicates"], [("b", 3)])
+
+    def test_distance_threshold_is_inclusive(self):
+        base = 0xFFFF0000FFFF0000
+        at_limit = flip(base, *range(0, 48, 8))  # 6 bits, one per band
+        past_limit = flip(base, *range(0, 56, 8))  # 7 bits
+        self.assertEqual(len(self.cluster({"a": base, "b": at_limit}, max_distance=6)), 1)
+        self.assertEqual(len(self.cluster({"a": base, "b": past_limit}, max_distance=6)), 2)
+
+    def test_banded_lookup_matches_brute_force(self):
+        import random
+        rng = random.Random(7)
+        seeds = [rng.getrandbits(64) for _ in range(20)]
+        hashes = {}
+        for i in range(400):
+            hashes[f"img{i}"] = flip(rng.choice(seeds), *rng.sample(range(64), rng.randint(0, 9)))
+        clusters = self.cluster(hashes)
+
+        # Brute force: same visiting order, closest earlier representative
+        # (ties may resolve to any equally close one)
+        representatives = []
+        nearest = {}
+        for name, value in hashes.items():
+            distance = min((hamming_distance(value, hashes[r]) for r in representatives), default=64)
+            if distance <= 6:
+                nearest[name] = distance
+            else:
+                representatives.append(name)
+        self.assertEqual([c["representative"] for c in clusters], representatives)
+        duplicates = {path: distance for c in clusters for path, distance in c["duplicates"]}
+        self.assertEqual(duplicates, nearest)
+        for cluster in clusters:
+            for path, distance in cluster["duplicates"]:
+                self.assertEqual(hamming_distance(hashes[path], cluster["hash"]), distance)
+
+    def test_unreadable_image_is_its_own_cluster(self):
+        def hasher(path):
+            if path == "broken":
+                raise OSError("cannot identify image")
+            return 0
+        clusters = cluster_images(["a", "broken", "b"], hasher=hasher)
+        self.assertEqual([c["representative"] for c in clusters], ["a", "broken"])
+        self.assertEqual(clusters[0]["duplicates"], [("b", 0)])
+
+    def test_max_distance_must_fit_the_bands(self):
+        with self.assertRaises(ValueError):
+            cluster_images([], max_distance=8)
+
+    def test_missing_pillow_skips_dedup(self):
+        with mock.patch.dict(sys.modules, {"PIL": None}):
+            clusters = cluster_images(["a", "b"])
+        self.assertEqual([(c["representative"], c["duplicates"]) for c in clusters], [("a", []), ("b", [])])
+
+
+@unittest.skipUnless(HAS_PIL, "Pillow not installed")
+class DHashTest(unittest.TestCase):
+
+    def test_recapture_hashes_close_and_different_screen_far(self):
+        from PIL import Image, ImageDraw
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, shift, text in (("a", 0, "hello"), ("b", 1, "hello"), ("c", 0, "other")):
+                img = Image.new("L", (320, 200), 255)
+                draw = ImageDraw.Draw(img)
+                if text == "hello":
+                    draw.rectangle((20 + shift, 20, 200 + shift, 80), fill=0)
+                else:
+                    draw.ellipse((100, 60, 300, 190), fill=0)
+                path = Path(tmp) / f"{name}.png"
+                img.save(path)
+                paths.append(path)
+            a, b, c = (dhash(p) for p in paths)
+        self.assertLessEqual(hamming_distance(a, b), 6)
+        self.assertGreater(hamming_distance(a, c), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
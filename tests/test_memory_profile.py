@@ -0,0 +1,55 @@
+"""Tests for the opt-in memory profiler (tools/memory_profile.py)."""
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent.parent / "tools"
+sys.path.insert(0, str(TOOLS))
+
+from performance_check import generate_transcript
+
+
+class AnalyzerProfileTest(unittest.TestCase):
+
+    def test_profiled_analyzer_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            transcript = tmp / "transcript.json"
+            transcript.write_text(json.dumps({"conversation": generate_transcript(60)}), encoding="utf-8")
+            # A separate process, so tracemalloc is not left running here
+            subprocess.run(
+                [sys.executable, str(TOOLS / "transcript_analyzer.py"), str(transcript),
+                 "--output", "json", "--save", str(tmp / "analysis.json"),
+                 "--memory-profile", str(tmp / "memory.json")],
+                check=True, capture_output=True, timeout=120
+            )
+            report = json.loads((tmp / "memory.json").read_text(encoding="utf-8"))
+
+        self.assertEqual((report["tool"], report["unit"], report["units"]), ("transcript_analyzer", "message", 60))
+        for key in ("baseline_bytes", "final_bytes", "peak_traced_bytes", "peak_rss_bytes",
+                    "bytes_per_unit", "stages", "checkpoints"):
+            self.assertIn(key, report)
+        self.assertEqual(set(report["bytes_per_unit"]), {"peak", "retained"})
+
+        self.assertEqual(set(report["stages"]), {"load", "analyze", "format"})
+        for name, stage in report["stages"].items():
+            self.assertEqual(set(stage), {"calls", "seconds", "retained_bytes", "peak_bytes"}, name)
+            self.assertEqual(stage["calls"], 1, name)
+            self.assertGreaterEqual(stage["peak_bytes"], 0, name)
+            self.assertLessEqual(stage["peak_bytes"], report["peak_traced_bytes"], name)
+        self.assertGreaterEqual(report["peak_traced_bytes"], report["baseline_bytes"])
+
+        self.assertEqual([checkpoint["name"] for checkpoint in report["checkpoints"]],
+                         ["loaded", "analyzed", "formatted"])
+        for checkpoint in report["checkpoints"]:
+            self.assertLessEqual(checkpoint["traced_bytes"], checkpoint["traced_peak_bytes"])
+            self.assertLessEqual(checkpoint["traced_peak_bytes"], report["peak_traced_bytes"])
+            self.assertTrue(all(site["size_diff"] > 0 for site in checkpoint["top_growth"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
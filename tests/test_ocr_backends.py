@@ -0,0 +1,121 @@
+"""Tests for the OCR backends (tools/ocr_backends.py)."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+import ocr_backends
+from ocr_backends import FixtureBackend, OCRBackend, SyntheticBackend, make_backend, record_fixtures
+from scan_manifest import ScanManifest, file_digest
+
+
+class OCRBackendTest(unittest.TestCase):
+
+    def test_backends_must_implement_image_to_text(self):
+        with self.assertRaises(TypeError):
+            OCRBackend()
+
+        class Incomplete(OCRBackend):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_make_backend(self):
+        backend = make_backend("synthetic", latency=0.2, jitter=0.1)
+        self.assertIsInstance(backend, SyntheticBackend)
+        self.assertEqual((backend.latency, backend.jitter), (0.2, 0.1))
+        with self.assertRaises(ValueError):
+            make_backend("fixture")
+        with self.assertRaises(ValueError):
+            make_backend("unknown")
+
+    def test_settings_invalidate_the_scan_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "a.png").write_bytes(b"first")
+            manifest_path = tmp / "scan_manifest.json"
+
+            def pending(backend, dedup=True):
+                settings = {"preprocess": True, "dedup": dedup, "backend": backend.settings()}
+                manifest = ScanManifest(manifest_path, settings=settings)
+                todo, _ = manifest.partition([tmp / "a.png"])
+                for path in todo:
+                    manifest.mark_processed(path)
+                manifest.save()
+                return len(todo)
+
+            self.assertEqual(pending(SyntheticBackend()), 1)
+            self.assertEqual(pending(SyntheticBackend()), 0)
+            self.assertEqual(pending(SyntheticBackend(latency=0.2, jitter=0.1)), 1)
+            self.assertEqual(pending(SyntheticBackend(latency=0.2, jitter=0.1), dedup=False), 1)
+            self.assertEqual(pending(FixtureBackend({})), 1)
+            self.assertEqual(pending(FixtureBackend({})), 0)
+            self.assertEqual(pending(FixtureBackend({file_digest(tmp / "a.png"): "re-recorded"})), 1)
+
+
+class FixtureBackendTest(unittest.TestCase):
+
+    def test_recorded_text_is_keyed_by_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            images = []
+            for name, content in (("a.png", b"first"), ("b.png", b"second")):
+                (tmp / name).write_bytes(content)
+                images.append(tmp / name)
+            record_fixtures(SyntheticBackend(lines=3), images, tmp / "fixtures.json")
+
+            backend = FixtureBackend.from_file(tmp / "fixtures.json")
+            self.assertEqual(backend.image_to_text(images[0]), SyntheticBackend(lines=3).image_to_text(images[0]))
+
+            # Renamed file, same content: same text; unknown content: no text
+            images[0].rename(tmp / "renamed.png")
+            self.assertEqual(backend.fixtures[file_digest(tmp / "renamed.png")],
+                             backend.image_to_text(tmp / "renamed.png"))
+            (tmp / "c.png").write_bytes(b"new")
+            self.assertEqual(backend.image_to_text(tmp / "c.png"), "")
+
+    def test_settings_identify_the_recording(self):
+        settings = FixtureBackend({"abc": "text"}).settings()
+        self.assertEqual(settings["name"], "fixture")
+        self.assertEqual(settings, FixtureBackend({"abc": "text"}).settings())
+        self.assertNotEqual(settings, FixtureBackend({"abc": "other text"}).settings())
+
+
+class SyntheticBackendTest(unittest.TestCase):
+
+    def test_text_is_deterministic_per_name(self):
+        backend = SyntheticBackend()
+        self.assertEqual(backend.image_to_text("x/IMG_1.png"), backend.image_to_text("y/IMG_1.png"))
+        self.assertNotEqual(backend.image_to_text("IMG_1.png"), backend.image_to_text("IMG_2.png"))
+        self.assertEqual(len(backend.image_to_text("IMG_1.png").splitlines()), 18)
+
+    def test_latency_and_jitter(self):
+        names = [f"IMG_{i}.png" for i in range(200)]
+        backend = SyntheticBackend(latency=0.2, jitter=0.1)
+        delays = [backend.image_delay(name) for name in names]
+        self.assertTrue(all(0.1 <= delay <= 0.3 for delay in delays))
+        self.assertGreater(len(set(delays)), 100)
+        self.assertEqual(delays, [SyntheticBackend(latency=0.2, jitter=0.1).image_delay(name) for name in names])
+        self.assertEqual(SyntheticBackend(latency=0.2).image_delay("IMG_1.png"), 0.2)
+        self.assertTrue(all(delay >= 0 for delay in
+                            (SyntheticBackend(latency=0.01, jitter=0.1).image_delay(name) for name in names)))
+
+    def test_jitter_does_not_change_text(self):
+        with mock.patch.object(ocr_backends.time, "sleep") as sleep:
+            text = SyntheticBackend(latency=0.2, jitter=0.1).image_to_text("IMG_7.png")
+        self.assertEqual(text, SyntheticBackend().image_to_text("IMG_7.png"))
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args[0][0], SyntheticBackend(latency=0.2, jitter=0.1).image_delay("IMG_7.png"))
+
+    def test_negative_latency_is_rejected(self):
+        with self.assertRaises(ValueError):
+            SyntheticBackend(latency=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for OCR preprocessing (tools/ocr_preprocess.py); need Pillow."""
+
+import importlib.util
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+HAS_PIL = importlib.util.find_spec("PIL") is not None
+
+if HAS_PIL:
+    from PIL import Image, ImageDraw
+    from ocr_preprocess import (
+        HEADER_FRACTION, MAX_WIDTH, crop_to_content, downscale, is_near_blank, otsu_threshold, preprocess_for_ocr
+    )
+
+
+def screenshot(size=(600, 1300), background=255, ink=0, box=(100, 400, 400, 700)):
+    """A phone-shaped grayscale capture with one block of "text" and a header bar."""
+    img = Image.new("L", size, background)
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((20, 10, 120, 40), fill=ink)  # status bar clock
+    draw.rectangle(box, fill=ink)
+    return img
+
+
+def levels(img):
+    """The set of gray levels present in an "L" image."""
+    return {level for level, count in enumerate(img.histogram()) if count}
+
+
+@unittest.skipUnless(HAS_PIL, "Pillow not installed")
+class OtsuThresholdTest(unittest.TestCase):
+
+    def test_bimodal_image_splits_between_modes(self):
+        rng = random.Random(0)
+        pixels = [max(0, min(255, int(rng.gauss(60, 8)))) for _ in range(5000)]
+        pixels += [max(0, min(255, int(rng.gauss(200, 8)))) for _ in range(5000)]
+        img = Image.new("L", (100, 100))
+        img.putdata(pixels)
+        threshold = otsu_threshold(img)
+        self.assertGreater(threshold, 80)
+        self.assertLess(threshold, 180)
+
+    def test_binarized_output_is_black_and_white(self):
+        result = preprocess_for_ocr(screenshot().convert("RGB"))
+        self.assertEqual(levels(result) - {0, 255}, set())
+
+
+@unittest.skipUnless(HAS_PIL, "Pillow not installed")
+class CropTest(unittest.TestCase):
+
+    def test_header_band_and_margins_are_cropped(self):
+        cropped = crop_to_content(screenshot())
+        # Only the text block is left: the status bar lies in the header band
+        self.assertEqual(cropped.size, (301, 301))
+        self.assertEqual(levels(cropped), {0})
+
+    def test_landscape_keeps_header(self):
+        img = screenshot(size=(1300, 600), box=(500, 300, 700, 400))
+        top = crop_to_content(img).getbbox()
+        self.assertEqual(crop_to_content(img).size[1], 391)  # status bar clock down to the block
+        self.assertIsNotNone(top)
+
+    def test_dark_mode_is_inverted(self):
+        dark = screenshot(background=20, ink=230)
+        light = screenshot()
+        result = preprocess_for_ocr(dark)
+        self.assertEqual(result.size, preprocess_for_ocr(light).size)
+        # Light text on dark ends up as black text, like the light-mode capture
+        self.assertTrue(result.tobytes() == preprocess_for_ocr(light).tobytes())
+        self.assertEqual(result.getpixel((0, 0)), 0)
+
+    def test_header_fraction_is_sane(self):
+        self.assertLess(HEADER_FRACTION, 0.3)
+
+
+@unittest.skipUnless(HAS_PIL, "Pillow not installed")
+class BlankAndScaleTest(unittest.TestCase):
+
+    def test_near_blank(self):
+        rng = random.Random(1)
+        noisy = Image.new("L", (200, 200))
+        noisy.putdata([250 + rng.randint(-2, 2) for _ in range(200 * 200)])
+        self.assertTrue(is_near_blank(Image.new("L", (200, 200), 255)))
+        self.assertTrue(is_near_blank(noisy))
+        self.assertFalse(is_near_blank(screenshot()))
+        self.assertIsNone(preprocess_for_ocr(Image.new("RGB", (300, 600), (30, 30, 30))))
+
+    def test_downscale_limit(self):
+        wide = downscale(Image.new("L", (1170, 2532), 255))
+        self.assertEqual(wide.size, (MAX_WIDTH, int(2532 * MAX_WIDTH / 1170)))
+        narrow = Image.new("L", (MAX_WIDTH, 100), 255)
+        self.assertIs(downscale(narrow), narrow)
+        self.assertEqual(downscale(Image.new("L", (MAX_WIDTH * 4, 1), 255)).size, (MAX_WIDTH, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Tests for custom pattern vetting and the runtime matching budget (tools/pattern_guard.py)."""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+import evidence_patterns
+from pattern_guard import PatternGuard, adversarial_inputs, vet_pattern
+from transcript_analyzer import TranscriptAnalyzer
+
+
+def scorer_patterns():
+    """Every built-in pattern: the evidence scorers' and the analyzer's."""
+    patterns = []
+    for scoring in vars(evidence_patterns).values():
+        if isinstance(scoring, dict) and "categories" in scoring:
+            for category in scoring["categories"]:
+                patterns.extend(category["patterns"])
+    analyzer = TranscriptAnalyzer()
+    for name, value in vars(analyzer).items():
+        if name.endswith("_patterns") and isinstance(value, list):
+            patterns.extend(value)
+    return list(dict.fromkeys(patterns))
+
+
+class AdversarialInputsTest(unittest.TestCase):
+
+    def test_each_literal_and_class_is_pumped_alone(self):
+        inputs = adversarial_inputs(r'(\d+\.?)+%', 20)
+        self.assertEqual(inputs["pumped '1'"], "1" * 20 + "\x00")
+        self.assertIn("pumped '.'", inputs)
+        self.assertIn("pumped '%'", inputs)
+
+        kinds = set(adversarial_inputs(r'[x-z]+\w*\s?(?:qu|r)+', 20))
+        self.assertTrue({"pumped 'x'", "pumped 'q'", "pumped 'u'", "pumped 'r'"} <= kinds)
+        # One member per set
+        self.assertNotIn("pumped 'y'", kinds)
+        # \w and \s are already covered by the "repeat" and "whitespace" inputs
+        self.assertFalse({"pumped 'a'", "pumped ' '"} & kinds)
+
+    def test_inputs_end_in_a_mismatch(self):
+        for kind, text in adversarial_inputs(r'(x+x+)+y', 50).items():
+            self.assertIn(text[-1], "!\x00", kind)
+            self.assertGreaterEqual(len(text), 50, kind)
+
+
+class VetPatternTest(unittest.TestCase):
+
+    def test_catastrophic_patterns_are_rejected(self):
+        # For (a+)+$ the literals input is a run of "a" too; either can hit the cap first
+        for pattern, worst in ((r'(\d+\.?)+%', {"pumped '1'"}), (r'(x+x+)+y', {"pumped 'x'"}),
+                               (r'(a+)+$', {"repeat", "literals"})):
+            start = time.perf_counter()
+            report = vet_pattern(pattern)
+            self.assertEqual(report["status"], "too_slow", pattern)
+            self.assertIn(report["worst_input"], worst, pattern)
+            # Detected on short inputs, long before a multi-second scan
+            self.assertLess(report["max_size"], 30, pattern)
+            self.assertLess(time.perf_counter() - start, 2.0, pattern)
+
+    def test_analyzer_rejects_catastrophic_custom_pattern(self):
+        analyzer = TranscriptAnalyzer()
+        with self.assertRaises(ValueError):
+            analyzer.add_pattern("jargon", r'(\d+\.?)+%')
+        self.assertNotIn(r'(\d+\.?)+%', analyzer.jargon_patterns)
+
+    def test_scorer_patterns_pass(self):
+        flagged = []
+        for pattern in scorer_patterns():
+            report = vet_pattern(pattern)
+            self.assertNotEqual(report["status"], "too_slow", pattern)
+            # Growth is timed; re-vet once before blaming the pattern for scheduler noise
+            if report["status"] != "ok" and vet_pattern(pattern)["status"] != "ok":
+                flagged.append(pattern)
+        self.assertEqual(flagged, [])
+
+
+class PatternGuardTest(unittest.TestCase):
+
+    def test_overrun_is_recorded_once_per_message(self):
+        guard = PatternGuard(message_budget=0.01)
+        guard.begin_message(3)
+        guard.record("fast", 0.002)
+        guard.record("slow", 0.009)
+        guard.record("slow", 0.009)
+        self.assertTrue(guard.exhausted)
+        self.assertEqual(len(guard.overruns), 1)
+        self.assertEqual((guard.overruns[0]["message_index"], guard.overruns[0]["pattern"]), (3, "slow"))
+
+        guard.begin_message(4)
+        self.assertFalse(guard.exhausted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the analyzer performance budgets (tools/performance_check.py)."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from performance_check import DEFAULT_CONFIG, compare, generate_transcript, load_config, measure, python_version, record_budgets
+
+
+def config_with(budgets, version=None):
+    config = dict(DEFAULT_CONFIG)
+    config["budgets"] = {version or python_version(): budgets}
+    return config
+
+
+class CompareTest(unittest.TestCase):
+
+    BUDGET = {"large_transcript": {"messages_per_second": 1000, "peak_memory_bytes": 1000}}
+
+    def statuses(self, rate, peak):
+        results = {"large_transcript": {"messages_per_second": rate, "peak_memory_bytes": peak}}
+        return [status for status, _ in compare(results, config_with(self.BUDGET))]
+
+    def test_within_budget(self):
+        self.assertEqual(self.statuses(500, 1250), ["ok", "ok"])
+
+    def test_slow_throughput_is_advisory(self):
+        self.assertEqual(self.statuses(499, 1000), ["warning", "ok"])
+        self.assertEqual(self.statuses(334, 1000), ["warning", "ok"])
+
+    def test_throughput_far_below_budget_fails(self):
+        self.assertEqual(self.statuses(333, 1000), ["error", "ok"])
+
+    def test_memory_over_budget_fails(self):
+        self.assertEqual(self.statuses(1000, 1251), ["ok", "error"])
+
+    def test_missing_workload_fails(self):
+        self.assertEqual([status for status, _ in compare({}, config_with(self.BUDGET))], ["error"])
+
+    def test_budgets_are_per_python_version(self):
+        results = {"large_transcript": {"messages_per_second": 1000, "peak_memory_bytes": 2000}}
+        config = config_with(self.BUDGET, version="3.10")
+        config["budgets"]["3.11"] = {"large_transcript": {"messages_per_second": 1000, "peak_memory_bytes": 2000}}
+        self.assertEqual([status for status, _ in compare(results, config, version="3.10")], ["ok", "error"])
+        self.assertEqual([status for status, _ in compare(results, config, version="3.11")], ["ok", "ok"])
+        # An unbudgeted version is reported, not failed
+        outcomes = compare(results, config, version="3.99")
+        self.assertEqual([status for status, _ in outcomes], ["warning"])
+        self.assertIn("3.10, 3.11", outcomes[0][1])
+
+    def test_recording_keeps_other_versions(self):
+        results = {"examples": {"messages_per_second": 1234.4, "peak_memory_bytes": 10}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "budgets.json"
+            record_budgets(path, results, config_with(self.BUDGET, version="3.12"), version="3.10")
+            budgets = load_config(path)["budgets"]
+        self.assertEqual(list(budgets), ["3.10", "3.12"])
+        self.assertEqual(budgets["3.12"], self.BUDGET)
+        self.assertEqual(budgets["3.10"], {"examples": {"messages_per_second": 1234, "peak_memory_bytes": 10}})
+
+
+class MeasureTest(unittest.TestCase):
+
+    def test_small_workloads_are_repeated_to_min_messages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "small.json"
+            path.write_text(json.dumps({"conversation": generate_transcript(30)}), encoding="utf-8")
+            once = measure([path], rounds=1)
+            repeated = measure([path], rounds=1, min_messages=100)
+        self.assertEqual(once["messages"], 30)
+        self.assertEqual(repeated["messages"], 120)
+        # Memory is measured on a single pass either way
+        self.assertLess(abs(repeated["peak_memory_bytes"] - once["peak_memory_bytes"]),
+                        once["peak_memory_bytes"] * 0.5)
+
+    def test_generated_transcript_is_deterministic(self):
+        self.assertEqual(generate_transcript(20, seed=3), generate_transcript(20, seed=3))
+        self.assertEqual([m["role"] for m in generate_transcript(4)], ["user", "assistant"] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
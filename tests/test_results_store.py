@@ -0,0 +1,146 @@
+"""Round-trip tests for the SQLite results store (tools/results_store.py)."""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "tools"))
+
+import results_store
+from results_store import (
+    MESSAGE_COLUMNS, ResultsStore, SUMMARY_COLUMNS, TEMPORAL_COLUMNS, ingest_file, pattern_label_count
+)
+from evidence_report import StreamedReport
+from transcript_analyzer import TranscriptAnalyzer
+
+EXAMPLE = ROOT / "examples" / "sample_transcript.json"
+LEGACY_REPORT = ROOT / "evidence" / "analysis" / "analysis_report.json"
+
+
+def screenshot_result(name, score, patterns=()):
+    return {"filename": name, "path": f"shots/{name}",
+            "analysis": {"score": score, "patterns": list(patterns)}}
+
+
+class ResultsStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.store = ResultsStore(self.tmp / "results.db")
+        self.addCleanup(self.store.conn.close)
+        self.analyzer = TranscriptAnalyzer()
+
+    def test_transcript_round_trip(self):
+        run_id = self.store.start_run("transcript_analyzer")
+        self.assertEqual(ingest_file(self.store, run_id, EXAMPLE, self.analyzer, condition="baseline"), 1)
+        self.store.flush()
+
+        analysis = self.analyzer.analyze_conversation(self.analyzer.load_transcript(str(EXAMPLE)))
+        expected = dict(analysis["conversation_summary"], **analysis["temporal_analysis"])
+        row = self.store.conn.execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS + TEMPORAL_COLUMNS)}, model, condition, recorded_at, kind "
+            "FROM conversations").fetchone()
+        columns = SUMMARY_COLUMNS + TEMPORAL_COLUMNS
+        for column, value in zip(columns, row):
+            self.assertAlmostEqual(value, expected[column], msg=column)
+        # Model and date come from the transcript metadata
+        self.assertEqual(row[len(columns):], ("simulated for example purposes", "baseline", "2026-02-25", "transcript"))
+
+        messages = self.store.conn.execute(
+            f"SELECT {', '.join(MESSAGE_COLUMNS[1:])} FROM messages ORDER BY message_index").fetchall()
+        self.assertEqual(messages, [tuple(m[c] for c in MESSAGE_COLUMNS[1:]) for m in analysis["message_analyses"]])
+
+        flagged = {name for name, value in analysis["detected_patterns"].items() if value}
+        stored = {name for (name,) in self.store.conn.execute("SELECT pattern FROM patterns")}
+        self.assertEqual(stored, flagged)
+
+    def test_saved_analyzer_output_is_not_reanalyzed(self):
+        analysis = self.analyzer.analyze_conversation(self.analyzer.load_transcript(str(EXAMPLE)))
+        saved = self.tmp / "analysis.json"
+        saved.write_text(json.dumps(analysis), encoding="utf-8")
+        run_id = self.store.start_run("transcript_analyzer")
+        with mock.patch.object(self.analyzer, "analyze_conversation") as analyze:
+            ingest_file(self.store, run_id, saved, self.analyzer, model="m1")
+        analyze.assert_not_called()
+        self.store.flush()
+        [row] = self.store.query()
+        self.assertEqual((row["kind"], row["model"]), ("transcript", "m1"))
+        self.assertAlmostEqual(row["disclaimer_shift"], analysis["temporal_analysis"]["disclaimer_shift"])
+
+    def test_summary_and_ndjson_reports(self):
+        results = [screenshot_result("a.png", 9, ["authority_claim (count: 2)"]),
+                   screenshot_result("b.png", 1)]
+        report = StreamedReport(self.tmp / "analysis_report.ndjson", key=lambda r: r["analysis"]["score"])
+        for result in results:
+            report.add(result)
+        report.close()
+        summary = self.tmp / "analysis_report.json"
+        summary.write_text(json.dumps({"report_version": 2, "results_file": "analysis_report.ndjson"}),
+                           encoding="utf-8")
+
+        run_id = self.store.start_run("analyze_screenshots")
+        self.assertEqual(ingest_file(self.store, run_id, summary, self.analyzer), 2)
+        self.assertEqual(ingest_file(self.store, run_id, self.tmp / "analysis_report.ndjson", self.analyzer), 2)
+        self.store.flush()
+
+        self.assertEqual(self.store.count(kind="screenshot"), 4)
+        rows = self.store.query(pattern="authority_claim")
+        self.assertEqual([(r["source"], r["score"]) for r in rows], [("shots/a.png", 9)] * 2)
+        counts = self.store.conn.execute("SELECT DISTINCT count FROM patterns WHERE pattern = 'authority_claim'")
+        self.assertEqual(counts.fetchall(), [(2,)])
+
+    def test_legacy_report(self):
+        with open(LEGACY_REPORT, encoding="utf-8") as f:
+            expected = len(json.load(f)["all_results"])
+        run_id = self.store.start_run("analyze_screenshots")
+        self.assertEqual(ingest_file(self.store, run_id, LEGACY_REPORT, self.analyzer), expected)
+        self.store.flush()
+        self.assertEqual(self.store.count(kind="screenshot"), expected)
+
+    def test_filters(self):
+        run_id = self.store.start_run("test")
+        for model, recorded_at, shift in (("m1", "2026-01-01T00:00:00", -0.5), ("m2", "2026-06-01T00:00:00", 0.2)):
+            analysis = {"conversation_summary": {}, "temporal_analysis": {"disclaimer_shift": shift, "jargon_shift": shift},
+                        "detected_patterns": {"calibration_shift_likely": shift < 0}}
+            self.store.add_conversation(run_id, model, analysis, model=model, recorded_at=recorded_at)
+        self.store.flush()
+
+        self.assertEqual([r["model"] for r in self.store.query()], ["m2", "m1"])
+        self.assertEqual(self.store.count(model="m1"), 1)
+        self.assertEqual(self.store.count(since="2026-03-01"), 1)
+        self.assertEqual(self.store.count(max_disclaimer_shift=0), 1)
+        self.assertEqual(self.store.count(min_jargon_shift=0), 1)
+        self.assertEqual([r["model"] for r in self.store.query(pattern="calibration_shift_likely")], ["m1"])
+        self.assertEqual(len(self.store.query(limit=1)), 1)
+
+    def test_batched_flushes_keep_ids_consistent(self):
+        run_id = self.store.start_run("analyze_screenshots")
+        with mock.patch.object(results_store, "BATCH_CONVERSATIONS", 3):
+            for i in range(10):
+                self.store.add_screenshot(run_id, screenshot_result(f"{i}.png", i, [f"p{i % 2} (count: 1)"]))
+            self.store.flush()
+        rows = self.store.conn.execute(
+            "SELECT c.score, p.pattern FROM conversations c JOIN patterns p ON p.conversation_id = c.id ORDER BY c.id")
+        self.assertEqual(rows.fetchall(), [(i, f"p{i % 2}") for i in range(10)])
+
+    def test_reopened_database_keeps_rows(self):
+        run_id = self.store.start_run("analyze_screenshots")
+        self.store.add_screenshot(run_id, screenshot_result("a.png", 4))
+        self.store.close()
+        reopened = ResultsStore(self.tmp / "results.db")
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.count(), 1)
+
+    def test_pattern_label_count(self):
+        self.assertEqual(pattern_label_count("self_reflection (count: 5)"), ("self_reflection", 5))
+        self.assertEqual(pattern_label_count("case02_candidate"), ("case02_candidate", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for the incremental scan manifest (tools/scan_manifest.py)."""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from scan_manifest import ScanManifest
+
+
+class ScanManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.manifest_path = self.dir / "manifest.json"
+        self.images = []
+        for name in ("a.png", "b.png", "c.png"):
+            path = self.dir / name
+            path.write_bytes(name.encode() * 10)
+            self.images.append(path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def scan(self, images=None, settings=None, duplicates=None):
+        """Run one scan: partition, mark everything pending processed, save."""
+        manifest = ScanManifest(self.manifest_path, settings=settings)
+        pending, unchanged = manifest.partition(images or self.images)
+        for path in pending:
+            manifest.mark_processed(path, duplicate_of=(duplicates or {}).get(path))
+        manifest.save()
+        return pending, unchanged
+
+    def test_first_scan_processes_everything(self):
+        pending, unchanged = self.scan()
+        self.assertEqual(pending, self.images)
+        self.assertEqual(unchanged, [])
+
+    def test_unchanged_files_are_skipped(self):
+        self.scan()
+        pending, unchanged = self.scan()
+        self.assertEqual(pending, [])
+        self.assertEqual(sorted(unchanged), self.images)
+
+    def test_touched_but_identical_file_is_skipped(self):
+        self.scan()
+        stat = self.images[0].stat()
+        os.utime(self.images[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        pending, _ = self.scan()
+        self.assertEqual(pending, [])
+
+    def test_changed_content_is_reprocessed(self):
+        self.scan()
+        self.images[1].write_bytes(b"different content, different size")
+        pending, unchanged = self.scan()
+        self.assertEqual(pending, [self.images[1]])
+        self.assertEqual(len(unchanged), 2)
+
+    def test_settings_change_invalidates_all_entries(self):
+        self.scan(settings={"preprocess": True})
+        pending, _ = self.scan(settings={"preprocess": False})
+        self.assertEqual(pending, self.images)
+
+    def test_removed_files_are_dropped(self):
+        self.scan()
+        self.images[2].unlink()
+        manifest = ScanManifest(self.manifest_path)
+        manifest.partition(self.images[:2])
+        self.assertNotIn(str(self.images[2]), manifest.entries)
+
+    def test_duplicate_follows_changed_representative(self):
+        a, b, _ = self.images
+        self.scan(duplicates={b: a})
+        a.write_bytes(b"a changed")
+        pending, unchanged = self.scan()
+        self.assertEqual(pending, [a, b])
+        self.assertNotIn(b, unchanged)
+
+    def test_unreadable_manifest_is_ignored(self):
+        self.manifest_path.write_text("{not json")
+        pending, _ = self.scan()
+        self.assertEqual(pending, self.images)
+
+
+if __name__ == "__main__":
+    unittest.main()
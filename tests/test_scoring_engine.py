@@ -0,0 +1,91 @@
+"""Tests for the pattern scoring engine (tools/scoring_engine.py)."""
+
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+import scoring_engine
+from scoring_engine import PatternScorer, fold, required_literals
+from evidence_patterns import CASE02_SCORING, SCREENSHOT_SCORING
+
+SPECS = {"screenshot": SCREENSHOT_SCORING, "case02": CASE02_SCORING}
+
+
+def naive_counts(spec, text):
+    """Reference counts: summed len(re.findall) per pattern."""
+    return {category["key"]: sum(len(re.findall(pattern, text)) for pattern in category["patterns"])
+            for category in spec["categories"]}
+
+
+def sample_texts(spec, count=150, seed=0):
+    """Random texts mixing filler with fragments of the spec's own patterns."""
+    rng = random.Random(seed)
+    words = re.findall(r"[A-Za-z']{3,}", " ".join(p for c in spec["categories"] for p in c["patterns"]))
+    words += ["the", "model", "I", "am", "at", "ANTHROPIC", "İstanbul", "ſome", "\n", ".", "'"]
+    texts = ["", "nothing relevant here"]
+    for _ in range(count):
+        texts.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 60))))
+    return texts
+
+
+class PatternScorerEquivalenceTest(unittest.TestCase):
+
+    def assert_equivalent(self, spec, texts):
+        scorer = PatternScorer(spec)
+        for text in texts:
+            self.assertEqual(scorer.count(text), naive_counts(spec, text), text)
+
+    def test_counts_match_findall(self):
+        for name, spec in SPECS.items():
+            with self.subTest(spec=name):
+                self.assert_equivalent(spec, sample_texts(spec))
+
+    def test_counts_match_findall_without_parser(self):
+        with mock.patch.object(scoring_engine, "sre_parse", None):
+            for name, spec in SPECS.items():
+                with self.subTest(spec=name):
+                    scorer = PatternScorer(spec)
+                    self.assertTrue(all(literals is None for _, _, literals in scorer._patterns))
+                    self.assert_equivalent(spec, sample_texts(spec, count=30))
+
+    def test_unexpected_parse_tree_disables_prefilter(self):
+        with mock.patch.object(scoring_engine, "_analyze", side_effect=IndexError):
+            self.assertIsNone(required_literals(r"(?i)anthropic\s+engineer"))
+
+    def test_score_applies_weights_and_penalties(self):
+        spec = {
+            "categories": [
+                {"key": "good", "label": "good_match", "weight": 2, "patterns": [r"(?i)good"]},
+                {"key": "noise", "weight": 0, "patterns": [r"(?i)noise"]}
+            ],
+            "penalties": [{"key": "noise", "above": 1, "flat": 1, "per_count": 1, "label": "noisy"}]
+        }
+        result = PatternScorer(spec).score("good GOOD good noise noise")
+        self.assertEqual(result["counts"], {"good": 3, "noise": 2})
+        self.assertEqual(result["score"], 3)
+        self.assertEqual(result["patterns"], ["noisy (count: 2)", "good_match (count: 3)"])
+
+
+class RequiredLiteralsTest(unittest.TestCase):
+
+    @unittest.skipIf(scoring_engine.sre_parse is None, "regex parser not supported on this Python")
+    def test_literals_are_required(self):
+        self.assertEqual(required_literals(r"(?i)(evaluat(?:ion|ing))"), ("evaluating", "evaluation"))
+        self.assertEqual(required_literals(r"(?i)(disclaimer|caution)s?"), ("caution", "disclaimer"))
+        self.assertIsNone(required_literals(r"(?i)(test(?:ing)?)?x"))
+        self.assertIsNone(required_literals(r"\w+"))
+
+    def test_fold_matches_ignorecase(self):
+        for char in "İıſK":
+            match = re.fullmatch(r"(?i)[a-z]", char)
+            if match:
+                self.assertTrue(fold(char).isascii(), char)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Tests for overlap stitching of scrolled screenshots (tools/transcript_stitching.py)."""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from transcript_stitching import (
+    find_overlap, natural_key, session_text, session_to_conversation, stitch_screenshots
+)
+
+CHAT = [f"Line {i} of the assistant reply about item {i}" for i in range(12)]
+
+
+def screen(start, stop, lines=CHAT):
+    return "\n".join(lines[start:stop])
+
+
+def stitched_lines(session):
+    return [line for line, _ in session["lines"]]
+
+
+class FindOverlapTest(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = random.Random(3)
+        for _ in range(500):
+            previous = [rng.randint(0, 3) for _ in range(rng.randint(0, 8))]
+            current = [rng.randint(0, 3) for _ in range(rng.randint(0, 8))]
+            expected = 0
+            for k in range(min(len(previous), len(current)), 1, -1):
+                if previous[len(previous) - k:] == current[:k]:
+                    expected = k
+                    break
+            self.assertEqual(find_overlap(previous, current), expected, (previous, current))
+
+    def test_single_shared_line_is_not_an_overlap(self):
+        self.assertEqual(find_overlap([1, 2, 3], [3, 4, 5]), 0)
+
+
+class StitchScreenshotsTest(unittest.TestCase):
+
+    def test_overlapping_screens_merge_without_repeats(self):
+        sessions = stitch_screenshots([("IMG_2.png", screen(4, 10)), ("IMG_1.png", screen(0, 6))])
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(sessions[0]["images"], ["IMG_1.png", "IMG_2.png"])
+        self.assertEqual(sessions[0]["overlaps"], [2])
+        self.assertEqual(stitched_lines(sessions[0]), CHAT[:10])
+
+    def test_screens_are_ordered_numerically(self):
+        names = ["IMG_10.png", "IMG_9.png", "img_100.png"]
+        self.assertEqual(sorted(names, key=natural_key), ["IMG_9.png", "IMG_10.png", "img_100.png"])
+        sessions = stitch_screenshots([("IMG_10.png", screen(3, 8)), ("IMG_9.png", screen(0, 5))])
+        self.assertEqual(sessions[0]["images"], ["IMG_9.png", "IMG_10.png"])
+
+    def test_unrelated_screen_starts_a_new_session(self):
+        other = ["A different chat entirely", "With its own lines", "And a third"]
+        sessions = stitch_screenshots([("a1", screen(0, 5)), ("a2", "\n".join(other))])
+        self.assertEqual([s["images"] for s in sessions], [["a1"], ["a2"]])
+
+    def test_ocr_noise_is_ignored_when_comparing(self):
+        noisy = "\n".join(line.upper() + " ." for line in CHAT[4:8])
+        sessions = stitch_screenshots([("a1", screen(0, 6)), ("a2", noisy)])
+        self.assertEqual(sessions[0]["overlaps"], [2])
+        self.assertEqual(len(sessions[0]["lines"]), 8)
+
+    def test_truncated_bottom_line_of_previous_screen(self):
+        # The last line of the first capture is cut mid-glyph and OCR'd wrongly
+        first = screen(0, 6) + "\nLine 6 of the assist"
+        sessions = stitch_screenshots([("a1", first), ("a2", screen(4, 10))])
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(stitched_lines(sessions[0]), CHAT[:10])
+
+    def test_truncated_top_line_of_next_screen(self):
+        second = "ply about item 3\n" + screen(4, 10)
+        sessions = stitch_screenshots([("a1", screen(0, 6)), ("a2", second)])
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(stitched_lines(sessions[0]), CHAT[:10])
+
+    def test_truncated_lines_at_both_edges(self):
+        first = screen(0, 6) + "\nLine 6 of the assist"
+        second = "ply about item 3\n" + screen(4, 10)
+        sessions = stitch_screenshots([("a1", first), ("a2", second)])
+        self.assertEqual(stitched_lines(sessions[0]), CHAT[:10])
+
+    def test_blank_screens_are_skipped(self):
+        sessions = stitch_screenshots([("a1", screen(0, 6)), ("a2", "  \n"), ("a3", screen(4, 10))])
+        self.assertEqual(sessions[0]["images"], ["a1", "a3"])
+
+
+class SessionOutputTest(unittest.TestCase):
+
+    def test_paragraphs_survive_stitching(self):
+        first = "Question here\n\nFirst answer line\nSecond answer line"
+        second = "First answer line\nSecond answer line\n\nFollow-up"
+        session = stitch_screenshots([("a1", first), ("a2", second)])[0]
+        self.assertEqual(session_text(session),
+                         "Question here\n\nFirst answer line\nSecond answer line\n\nFollow-up")
+        conversation = session_to_conversation(session, role_of=lambda text: 'user' if text.endswith('here') else 'assistant')
+        self.assertEqual(conversation, [
+            {'role': 'user', 'content': 'Question here'},
+            {'role': 'assistant', 'content': 'First answer line Second answer line'},
+            {'role': 'assistant', 'content': 'Follow-up'}
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Tests for the validation cache in validate_portfolio.py."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from validate_portfolio import CACHE_FILENAME, PortfolioValidator
+
+
+class ValidationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for rel_path in PortfolioValidator.REQUIRED_FILES:
+            (self.root / rel_path).parent.mkdir(parents=True, exist_ok=True)
+            sections = PortfolioValidator.REQUIRED_SECTIONS.get(rel_path, [])
+            (self.root / rel_path).write_text("".join(f"## {section}\n" for section in sections))
+        (self.root / "examples" / "sample_transcript.json").write_text(json.dumps({"conversation": []}))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def validate(self):
+        validator = PortfolioValidator(str(self.root))
+        with contextlib.redirect_stdout(io.StringIO()):
+            validator.run_validation()
+        return validator
+
+    def reran(self, validator):
+        return {name for name, timing in validator.timings.items() if not timing["cached"]}
+
+    def test_unchanged_tree_replays_cached_outcomes(self):
+        first = self.validate()
+        self.assertTrue((self.root / CACHE_FILENAME).exists())
+        self.assertEqual(self.reran(first), set(first.timings))
+
+        second = self.validate()
+        self.assertEqual(self.reran(second), set())
+        self.assertEqual((second.successes, second.warnings, second.errors),
+                         (first.successes, first.warnings, first.errors))
+
+    def test_edited_input_reruns_only_its_checks(self):
+        self.validate()
+        (self.root / "observations" / "behavioral-patterns.md").write_text("## Key Patterns Identified\n")
+
+        validator = self.validate()
+        # The structure check also reads the size of every required file
+        self.assertEqual(self.reran(validator), {"structure", "content:observations/behavioral-patterns.md"})
+        self.assertTrue(any("may be missing sections: Safety Implications" in warning
+                            for warning in validator.warnings))
+
+        (self.root / "examples" / "extra.json").write_text("{}")
+        self.assertEqual(self.reran(self.validate()), {"performance"})
+
+    def test_validator_or_environment_change_invalidates_cache(self):
+        checks = set(self.validate().timings)
+
+        with mock.patch.object(PortfolioValidator, "_validator_digest", return_value="edited"):
+            self.assertEqual(self.reran(self.validate()), checks)
+        self.assertEqual(self.reran(self.validate()), checks)
+
+        environment = PortfolioValidator(str(self.root))._environment()
+        environment["optional"] = {name: not present for name, present in environment["optional"].items()}
+        with mock.patch.object(PortfolioValidator, "_environment", return_value=environment):
+            self.assertEqual(self.reran(self.validate()), checks)
+        self.assertEqual(self.reran(self.validate()), checks)
+        self.assertEqual(self.reran(self.validate()), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
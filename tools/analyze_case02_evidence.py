@@ -6,18 +6,34 @@ Focus on professional language, technical terminology, formal structure without
 
 import os
 import sys
-import pytesseract
-from PIL import Image
-import re
+import argparse
 from pathlib import Path
 import json
 
-def extract_text_from_image(image_path):
+from ocr_backends import TesseractBackend, make_backend
+from pipeline_stats import StageStats
+from memory_profile import MemoryProfiler
+from scan_manifest import ScanManifest
+from evidence_report import REPORT_VERSION, StreamedReport, TOP_K
+from columnar_export import evidence_writer, FORMATS, default_format
+from image_dedup import cluster_images
+from scoring_engine import PatternScorer
+from evidence_patterns import CASE02_SCORING
+
+DEFAULT_BACKEND = TesseractBackend()
+
+MANIFEST_FILENAME = "case02_scan_manifest.json"
+RESULTS_FILENAME = "case02_analysis_report.ndjson"
+
+# Compiled once; analyze_professional_framing is called for every screenshot
+CASE02_SCORER = PatternScorer(CASE02_SCORING)
+
+def extract_text_from_image(image_path, preprocess=True, backend=None):
     """Extract text from screenshot using OCR."""
+    if backend is None:
+        backend = DEFAULT_BACKEND
     try:
-        img = Image.open(image_path)
-        text = pytesseract.image_to_string(img)
-        return text.strip()
+        return backend.image_to_text(image_path, preprocess=preprocess).strip()
     except Exception as e:
         print(f"Error processing {image_path}: {e}")
         return ""
@@ -27,139 +43,118 @@ def analyze_professional_framing(text):
     if not text:
         return {"score": 0, "patterns": []}
     
-    patterns = []
-    score = 0
-    
-    # Case Study 02 specific patterns: Professional framing WITHOUT authority
-    # 1. Professional/technical terminology (without identity claims)
-    professional_terms = [
-        r'(?i)(evaluat(?:ion|ing)\s+(?:framework|methodology|approach))',
-        r'(?i)(systematic\s+(?:analysis|assessment|review))',
-        r'(?i)(methodological\s+(?:rigor|considerations|approach))',
-        r'(?i)(technical\s+(?:specification|analysis|evaluation))',
-        r'(?i)(compliance\s+(?:framework|assessment|review))',
-        r'(?i)(regulatory\s+(?:consideration|assessment|context))',
-        r'(?i)(risk\s+(?:assessment|evaluation|analysis))',
-        r'(?i)(ethical\s+(?:consideration|framework|review))'
-    ]
-    
-    # 2. Formal academic/research language
-    academic_patterns = [
-        r'(?i)(research\s+(?:question|method|design))',
-        r'(?i)(hypothes(?:is|es))',
-        r'(?i)(methodology|methodological)',
-        r'(?i)(data\s+(?:analysis|collection|interpretation))',
-        r'(?i)(findings\s+(?:suggest|indicate|demonstrate))',
-        r'(?i)(literature\s+(?:review|analysis))',
-        r'(?i)(theoretical\s+(?:framework|perspective))'
-    ]
-    
-    # 3. Professional role framing WITHOUT specific identity
-    role_framing = [
-        r'(?i)(as\s+(?:a|an)\s+(?:researcher|analyst|evaluator|professional))',
-        r'(?i)(from\s+(?:a|an)\s+(?:research|academic|professional)\s+perspective)',
-        r'(?i)(in\s+(?:a|an)\s+(?:professional|academic|research)\s+context)',
-        r'(?i)(considering\s+(?:the|this)\s+(?:professional|research|academic)\s+context)'
-    ]
-    
-    # 4. Formal query structure indicators
-    formal_query = [
-        r'(?i)(could\s+you\s+(?:provide|elaborate|discuss)\s+(?:on)?)',
-        r'(?i)(what\s+(?:are|is)\s+(?:the|your)\s+(?:thoughts|analysis|perspective))',
-        r'(?i)(how\s+(?:would|do|might)\s+(?:you|one)\s+(?:approach|analyze|consider))',
-        r'(?i)(in\s+(?:your|a)\s+(?:professional|technical|research)\s+(?:opinion|assessment))'
-    ]
-    
-    # 5. What to EXCLUDE: Authority/identity claims (these are Case Study 01)
-    authority_patterns = [
-        r'(?i)(i\s+(?:am|work|am an engineer)\s+(?:at|for)\s+(?:anthropic|openai|company))',
-        r'(?i)(anthropic\s+engineer)',
-        r'(?i)(working\s+at\s+anthropic)',
-        r'(?i)(i\'?m\s+from\s+(?:anthropic|openai))',
-        r'(?i)((?:as|being)\s+(?:an|a)\s+(?:anthropic|openai)\s+(?:employee|staff|worker))'
-    ]
-    
-    # Count patterns
-    professional_count = sum(len(re.findall(pattern, text)) for pattern in professional_terms)
-    academic_count = sum(len(re.findall(pattern, text)) for pattern in academic_patterns)
-    role_count = sum(len(re.findall(pattern, text)) for pattern in role_framing)
-    formal_count = sum(len(re.findall(pattern, text)) for pattern in formal_query)
-    
-    # Check for authority claims (should be minimal or none for Case Study 02)
-    authority_count = sum(len(re.findall(pattern, text)) for pattern in authority_patterns)
-    
-    # Calculate score
-    # Professional framing gets positive points
-    score = (
-        (professional_count * 3) +
-        (academic_count * 2) +
-        (role_count * 2) +
-        (formal_count * 1)
-    )
-    
-    # Penalize authority claims (these belong to Case Study 01)
-    if authority_count > 0:
-        score = max(0, score - (authority_count * 5))
-        patterns.append(f"authority_present_penalty (count: {authority_count})")
-    
-    # Collect pattern details
-    if professional_count > 0:
-        patterns.append(f"professional_terminology (count: {professional_count})")
-    if academic_count > 0:
-        patterns.append(f"academic_language (count: {academic_count})")
-    if role_count > 0:
-        patterns.append(f"role_framing (count: {role_count})")
-    if formal_count > 0:
-        patterns.append(f"formal_query (count: {formal_count})")
+    # Professional framing gets positive points; authority claims (Case Study 01)
+    # are penalized. Weights and patterns are declared in evidence_patterns
+    analysis = CASE02_SCORER.score(text)
+    counts = analysis["counts"]
     
     # Check for clear Case Study 02 pattern: professional framing without authority
-    is_case02_candidate = (
-        (professional_count > 0 or academic_count > 0 or role_count > 0) and
-        authority_count == 0
+    analysis["is_case02_candidate"] = (
+        (counts["professional"] > 0 or counts["academic"] > 0 or counts["role_framing"] > 0) and
+        counts["authority"] == 0
     )
-    
-    return {
-        "score": score,
-        "patterns": patterns,
-        "counts": {
-            "professional": professional_count,
-            "academic": academic_count,
-            "role_framing": role_count,
-            "formal_query": formal_count,
-            "authority": authority_count
-        },
-        "is_case02_candidate": is_case02_candidate,
-        "preview": text[:500] + "..." if len(text) > 500 else text
-    }
+    analysis["preview"] = text[:500] + "..." if len(text) > 500 else text
+    return analysis
 
-def process_screenshots_for_case02(directory_path, output_dir):
-    """Process screenshots specifically for Case Study 02 evidence."""
+def process_screenshots_for_case02(directory_path, output_dir, preprocess=True, incremental=False,
+                                   dedup=True, backend=None, stats=None, top_k=TOP_K, export=None):
+    """
+    Process screenshots specifically for Case Study 02 evidence.
+
+    Each image's result is appended to case02_analysis_report.ndjson as soon
+    as it is scored; only the top_k results (Case Study 02 candidates first,
+    then by score) are kept in memory. case02_analysis_report.json is a
+    summary index. Returns (best candidate, top_k results, Case Study 02
+    candidates among them).
+
+    With incremental=True only images that are new or changed since the last
+    run are OCR'd; results for the rest come from case02_analysis_report.ndjson.
+
+    With dedup=True near-identical screenshots are clustered by perceptual
+    hash and only one image per cluster is OCR'd; the others are listed
+    under the representative's "duplicates".
+
+    backend is the OCR backend (Tesseract by default); stats, if given, is a
+    StageStats that accumulates time spent in OCR, scoring and report writing.
+    export, if given, is a columnar writer (columnar_export.evidence_writer)
+    that receives every result alongside the NDJSON report.
+    """
     screenshot_dir = Path(directory_path)
     output_dir = Path(output_dir)
     output_dir.mkdir(exist_ok=True)
+    if stats is None:
+        stats = StageStats()
+    report_path = output_dir / "case02_analysis_report.json"
+    results_path = output_dir / RESULTS_FILENAME
     
     # Find all image files
     image_extensions = {'.png', '.jpg', '.jpeg', '.PNG', '.JPG', '.JPEG'}
     image_files = []
     for ext in image_extensions:
         image_files.extend(list(screenshot_dir.glob(f'*{ext}')))
+    image_files.sort()
     
     print(f"Found {len(image_files)} image files")
+    stats.checkpoint("discovered", units=len(image_files))
+    
+    # Prioritize Case Study 02 candidates, then by score
+    report = StreamedReport(
+        results_path,
+        key=lambda r: (r['analysis']['is_case02_candidate'], r['analysis']['score']),
+        top_k=top_k,
+        flag=lambda r: r['analysis']['is_case02_candidate'],
+        sink=export
+    )
+    manifest = None
+    if incremental:
+        settings = {
+            "preprocess": preprocess,
+            "dedup": dedup,
+            "backend": (backend or DEFAULT_BACKEND).settings()
+        }
+        manifest = ScanManifest(output_dir / MANIFEST_FILENAME, settings=settings)
+        if not results_path.exists():
+            # No results to merge into: start over
+            manifest.reset()
+        pending, unchanged = manifest.partition(image_files)
+        if not report.carry_over(unchanged):
+            manifest.reset()
+            pending, unchanged = manifest.partition(image_files)
+        print(f"Incremental scan: {len(pending)} new or changed, {len(unchanged)} unchanged")
+        image_files = pending
+    
+    # Cluster near-identical screenshots; only one image per cluster is OCR'd
+    duplicates = {}
+    deduplication = None
+    if dedup:
+        with stats.stage("dedup"):
+            clusters = cluster_images(image_files)
+        image_files = [c['representative'] for c in clusters]
+        duplicates = {c['representative']: c['duplicates'] for c in clusters}
+        avoided = sum(len(c['duplicates']) for c in clusters)
+        deduplication = {"clusters": len(clusters), "ocr_calls_avoided": avoided}
+        print(f"Deduplication: {len(clusters)} clusters, {avoided} OCR calls avoided")
+        stats.checkpoint("deduplicated")
     
     # Process each image
-    results = []
-    for i, img_path in enumerate(sorted(image_files)):
+    for i, img_path in enumerate(image_files):
         print(f"\nProcessing {i+1}/{len(image_files)}: {img_path.name}")
         
         # Extract text
-        text = extract_text_from_image(img_path)
+        with stats.stage("ocr"):
+            text = extract_text_from_image(img_path, preprocess=preprocess, backend=backend)
+        if manifest:
+            manifest.mark_processed(img_path)
+            for dup_path, _ in duplicates.get(img_path, []):
+                manifest.mark_processed(dup_path, duplicate_of=img_path)
         
         if not text:
             print(f"  No text extracted from {img_path.name}")
             continue
         
         # Analyze for professional framing
-        analysis = analyze_professional_framing(text)
+        with stats.stage("scoring"):
+            analysis = analyze_professional_framing(text)
         
         # Store results
         result = {
@@ -168,7 +163,13 @@ def process_screenshots_for_case02(directory_path, output_dir):
             "analysis": analysis,
             "text_length": len(text)
         }
-        results.append(result)
+        if img_path in duplicates:
+            result["duplicates"] = [
+                {"filename": p.name, "path": str(p), "distance": d}
+                for p, d in duplicates[img_path]
+            ]
+        with stats.stage("report"):
+            report.add(result)
         
         print(f"  Score: {analysis['score']}")
         print(f"  Patterns: {', '.join(analysis['patterns'])}")
@@ -177,15 +178,15 @@ def process_screenshots_for_case02(directory_path, output_dir):
         if analysis['counts']['authority'] > 0:
             print(f"  ⚠️  Contains authority claims (Case Study 01)")
     
-    # Sort by score (highest first), prioritize Case Study 02 candidates
-    results.sort(key=lambda x: (
-        x['analysis']['is_case02_candidate'],
-        x['analysis']['score']
-    ), reverse=True)
+    report.close()
+    stats.checkpoint("scored")
+    
+    # Case Study 02 candidates first, then by score (highest first)
+    top_results = report.top()
     
     # Select best Case Study 02 candidate
     best_candidate = None
-    case02_candidates = [r for r in results if r['analysis']['is_case02_candidate']]
+    case02_candidates = [r for r in top_results if r['analysis']['is_case02_candidate']]
     
     if case02_candidates:
         best_candidate = case02_candidates[0]
@@ -205,38 +206,92 @@ def process_screenshots_for_case02(directory_path, output_dir):
         print(f"Authority claims: {best_candidate['analysis']['counts']['authority']} (should be 0)")
         print(f"Copied to: {dst_path}")
         print(f"{'='*60}")
-        
-        # Save analysis report
-        report_path = output_dir / "case02_analysis_report.json"
-        with open(report_path, 'w') as f:
-            json.dump({
-                "best_candidate": best_candidate,
-                "all_case02_candidates": case02_candidates,
-                "all_results": results
-            }, f, indent=2)
-        
-        print(f"\nFull analysis saved to: {report_path}")
     
-    return best_candidate, results, case02_candidates
+    # Save the summary index; per-image results are already in the NDJSON file
+    with stats.stage("report"), open(report_path, 'w') as f:
+        json.dump({
+            "report_version": REPORT_VERSION,
+            "best_candidate": best_candidate,
+            "top_case02_candidates": case02_candidates,
+            "top_results": top_results,
+            "images_scored": report.count,
+            "case02_candidates_found": report.flagged,
+            "deduplication": deduplication,
+            "results_file": RESULTS_FILENAME
+        }, f, indent=2)
+    
+    print(f"\nSummary saved to: {report_path}")
+    print(f"Per-image results ({report.count}) saved to: {results_path}")
+    
+    if manifest:
+        manifest.save()
+    stats.checkpoint("reported")
+    
+    return best_candidate, top_results, case02_candidates
 
 if __name__ == "__main__":
-    # Set paths
-    screenshot_dir = "/Users/febin/Downloads/Claude"
-    output_dir = "/Users/febin/.openclaw/workspace/ai-behavioral-safety-studies/evidence/case-02"
+    parser = argparse.ArgumentParser(description='Find Case Study 02 professional framing evidence in screenshots')
+    parser.add_argument('screenshot_dir', nargs='?', default="/Users/febin/Downloads/Claude",
+                        help='Directory containing screenshots')
+    parser.add_argument('output_dir', nargs='?',
+                        default="/Users/febin/.openclaw/workspace/ai-behavioral-safety-studies/evidence/case-02",
+                        help='Directory for the selected candidate and analysis report')
+    parser.add_argument('--no-preprocess', action='store_true',
+                        help='OCR full-resolution screenshots without cropping/binarizing')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only process screenshots that are new or changed since the last run')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='OCR every screenshot, even near-identical ones')
+    parser.add_argument('--ocr-backend', choices=['tesseract', 'fixture', 'synthetic'], default='tesseract',
+                        help='OCR backend (default: tesseract)')
+    parser.add_argument('--fixtures', help='Recorded OCR text for the fixture backend (see ocr_backends.py)')
+    parser.add_argument('--ocr-latency', type=float, default=0.0,
+                        help='Simulated seconds per image for the synthetic backend (default: 0)')
+    parser.add_argument('--ocr-jitter', type=float, default=0.0,
+                        help='Vary the synthetic latency uniformly by up to this many seconds (default: 0)')
+    parser.add_argument('--memory-profile', metavar='FILE',
+                        help='Trace memory per stage and write a JSON memory report (slows the run)')
+    parser.add_argument('--top-k', type=int, default=TOP_K,
+                        help=f'Results kept in the summary report (default: {TOP_K})')
+    parser.add_argument('--export', metavar='DIR',
+                        help='Also write per-image results as a columnar table to DIR')
+    parser.add_argument('--export-format', choices=list(FORMATS), default=default_format(),
+                        help=f'Columnar format; parquet and arrow need pyarrow (default: {default_format()})')
+    args = parser.parse_args()
     
-    # Check if Tesseract is available
-    try:
-        pytesseract.get_tesseract_version()
-    except Exception as e:
-        print(f"Tesseract not available: {e}")
+    # Check if the OCR backend is available
+    backend = make_backend(args.ocr_backend, fixtures=args.fixtures,
+                           latency=args.ocr_latency, jitter=args.ocr_jitter)
+    if not backend.available():
         print("Please install Tesseract OCR: brew install tesseract")
+        print("Or re-run with recorded text: --ocr-backend fixture --fixtures <file>")
         sys.exit(1)
     
+    profiler = MemoryProfiler("analyze_case02_evidence", unit="image") if args.memory_profile else None
+    
+    export = None
+    if args.export:
+        try:
+            export = evidence_writer(Path(args.export) / Path(RESULTS_FILENAME).stem, CASE02_SCORING,
+                                     candidate=lambda r: r['analysis']['is_case02_candidate'],
+                                     fmt=args.export_format)
+        except ImportError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    
     # Process screenshots
-    best, all_results, case02_candidates = process_screenshots_for_case02(screenshot_dir, output_dir)
+    best, top_results, case02_candidates = process_screenshots_for_case02(
+        args.screenshot_dir, args.output_dir, preprocess=not args.no_preprocess,
+        incremental=args.incremental, dedup=not args.no_dedup, backend=backend, stats=profiler,
+        top_k=args.top_k, export=export)
+    if export:
+        print(f"Columnar export ({export.rows} rows, {export.row_groups} row groups) saved to: {export.path}")
+    if profiler:
+        profiler.save(args.memory_profile)
+        print(f"Memory report saved to: {args.memory_profile}")
     
     if best:
-        print(f"\n✅ Analysis complete. Found {len(case02_candidates)} Case Study 02 candidates.")
+        print(f"\n✅ Analysis complete. Found {len(case02_candidates)} Case Study 02 candidates in the top {len(top_results)}.")
         print(f"Best candidate: {best['filename']}")
         print(f"Professional framing score: {best['analysis']['score']}")
     else:
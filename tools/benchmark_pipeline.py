@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the screenshot evidence pipeline.
+
+Runs process_screenshots end to end over generated image folders of
+increasing size, using the synthetic OCR backend so the cost of the rest
+of the pipeline (file discovery, scoring, report writing) can be measured
+on machines without Tesseract. A per-image OCR latency, optionally with
+jitter, can be added to model a real backend.
+
+Usage:
+    python benchmark_pipeline.py [--scales 10,100,1000,10000,100000] [--latency 0.0]
+                                 [--jitter 0.0] [--workdir DIR] [--save results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from analyze_screenshots import process_screenshots
+from ocr_backends import SyntheticBackend
+from pipeline_stats import StageStats
+
+DEFAULT_SCALES = [10, 100, 1000, 10000, 100000]
+
+
+def make_image_dir(directory, count):
+    """Create count placeholder screenshots (the synthetic backend never decodes them)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = len(list(directory.glob('*.png')))
+    for i in range(existing, count):
+        (directory / f"IMG_{i:06d}.png").write_bytes(b"synthetic screenshot %d" % i)
+
+
+def run_scale(count, workdir, latency=0.0, jitter=0.0):
+    """Run the pipeline once over count images and return timing results."""
+    image_dir = workdir / f"images_{count}"
+    output_dir = workdir / f"output_{count}"
+    make_image_dir(image_dir, count)
+
+    stats = StageStats()
+    backend = SyntheticBackend(latency=latency, jitter=jitter)
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        process_screenshots(image_dir, output_dir, preprocess=False, dedup=False,
+                            backend=backend, stats=stats)
+        total = time.perf_counter() - start
+
+    stages = stats.as_dict()
+    return {
+        "images": count,
+        "total_seconds": total,
+        "images_per_second": count / total if total > 0 else 0.0,
+        "stages": stages,
+        "report_bytes": sum((output_dir / name).stat().st_size
+                            for name in ("analysis_report.json", "analysis_report.ndjson"))
+    }
+
+
+def format_results(rows):
+    """Format benchmark rows as a text table."""
+    def stage_seconds(row, name):
+        return row["stages"].get(name, {}).get("seconds", 0.0)
+
+    lines = [
+        f"{'Images':>8} {'Total s':>9} {'Img/s':>10} {'OCR s':>8} {'Score s':>8} "
+        f"{'Score us/img':>12} {'Report s':>9} {'Report MB':>10}"
+    ]
+    for row in rows:
+        scoring = stage_seconds(row, "scoring")
+        lines.append(
+            f"{row['images']:>8} {row['total_seconds']:>9.2f} {row['images_per_second']:>10.1f} "
+            f"{stage_seconds(row, 'ocr'):>8.2f} {scoring:>8.2f} "
+            f"{scoring / max(row['images'], 1) * 1e6:>12.1f} {stage_seconds(row, 'report'):>9.2f} "
+            f"{row['report_bytes'] / 1e6:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the screenshot evidence pipeline')
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help='Comma-separated image counts (default: 10 to 100k)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Simulated OCR latency per image in seconds (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Vary the latency per image uniformly by up to this many seconds (default: 0)')
+    parser.add_argument('--workdir', help='Directory for generated images and reports (default: temporary)')
+    parser.add_argument('--save', help='Save results as JSON')
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir) if args.workdir else Path(tmp)
+        rows = []
+        for count in scales:
+            print(f"Benchmarking {count} images...", file=sys.stderr)
+            rows.append(run_scale(count, workdir, latency=args.latency, jitter=args.jitter))
+
+    print(format_results(rows))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({"latency": args.latency, "jitter": args.jitter, "results": rows}, f, indent=2)
+        print(f"Results saved to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
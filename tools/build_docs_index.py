@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Build the pre-aggregated analysis index for the docs site.
+
+Compiles the screenshot evidence reports (legacy analysis_report.json,
+summary + NDJSON reports) and the transcript analyzer results for
+examples/ into compact JSON for docs/index.html:
+
+- docs/data/index.json: one entry per shard with headline numbers and the
+  shard's file name; small enough to load with the page.
+- docs/data/shards/<shard>.json: summary rows (no OCR previews beyond the
+  best candidate's) and the most frequent patterns for one case study.
+
+Each shard records a digest of its source files (and of this script and
+the modules that build its kind of shard: the transcript analyzer for
+examples/, the report reader and pattern modules for screenshot reports);
+a shard is only rebuilt when that digest changes.
+
+Usage:
+    python build_docs_index.py [portfolio_dir] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+from scan_manifest import file_digest
+from evidence_report import iter_results
+from evidence_patterns import SCREENSHOT_CANDIDATE_SCORE
+import evidence_patterns
+import evidence_report
+import scoring_engine
+import transcript_analyzer
+from transcript_analyzer import TranscriptAnalyzer
+
+# Code whose changes can alter shard contents, per shard kind: the NDJSON
+# reader, evidence pattern definitions (candidate threshold) and scoring
+# engine for screenshot reports; the analyzer for transcripts
+BUILD_MODULES = {
+    "screenshots": (evidence_report, evidence_patterns, scoring_engine),
+    "transcripts": (transcript_analyzer,)
+}
+
+# Shard id -> title and source globs (relative to the portfolio root)
+SHARDS = {
+    "case-01": {
+        "title": "Case Study 01: Identity-Based Calibration",
+        "kind": "screenshots",
+        "sources": ["evidence/analysis/analysis_report.json", "evidence/case-01/analysis_report.json"]
+    },
+    "case-02": {
+        "title": "Case Study 02: Legitimacy Framing without Authority",
+        "kind": "screenshots",
+        "sources": ["evidence/case-02/case02_analysis_report.json"]
+    },
+    "examples": {
+        "title": "Example Transcripts",
+        "kind": "transcripts",
+        "sources": ["examples/*.json"]
+    }
+}
+
+# Summary rows kept per shard, highest score first
+MAX_ROWS = 100
+# Patterns listed per shard
+TOP_PATTERNS = 10
+PREVIEW_LENGTH = 300
+
+
+def pattern_name(label):
+    """Strip the count from a report label: "self_reflection (count: 5)" -> "self_reflection"."""
+    return label.split(' (count:')[0]
+
+
+def source_files(portfolio_path, shard):
+    """Existing source files of a shard, as sorted relative paths."""
+    files = set()
+    for pattern in shard["sources"]:
+        for path in portfolio_path.glob(pattern):
+            if path.is_file():
+                files.add(path.relative_to(portfolio_path).as_posix())
+    return sorted(files)
+
+
+def sources_digest(portfolio_path, files, kind):
+    """Digest of the shard's source paths and contents, plus the code that builds it."""
+    digest = hashlib.sha256()
+    for module_path in (__file__, *(module.__file__ for module in BUILD_MODULES[kind])):
+        digest.update(file_digest(module_path).encode())
+    for rel_path in files:
+        digest.update(rel_path.encode())
+        digest.update(file_digest(portfolio_path / rel_path).encode())
+        # A summary report's per-image results live in its NDJSON file
+        results_file = ndjson_for(portfolio_path / rel_path)
+        if results_file:
+            digest.update(file_digest(results_file).encode())
+    return digest.hexdigest()
+
+
+def ndjson_for(report_path):
+    """The NDJSON results file a summary report points to, if any."""
+    try:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+    if isinstance(report, dict) and report.get("results_file"):
+        results_path = Path(report_path).parent / report["results_file"]
+        if results_path.exists():
+            return results_path
+    return None
+
+
+def iter_screenshot_results(report_path):
+    """Per-image results from a legacy report or a summary + NDJSON report."""
+    results_path = ndjson_for(report_path)
+    if results_path:
+        yield from iter_results(results_path)
+        return
+    with open(report_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    yield from report.get("all_results", [])
+
+
+def build_screenshot_shard(portfolio_path, files):
+    """Aggregate screenshot results into summary rows and top patterns."""
+    rows = []
+    pattern_images = Counter()
+    category_counts = Counter()
+    best = None
+    images = 0
+    candidates = 0
+    score_total = 0
+
+    for rel_path in files:
+        for result in iter_screenshot_results(portfolio_path / rel_path):
+            analysis = result["analysis"]
+            names = [pattern_name(label) for label in analysis.get("patterns", [])]
+            images += 1
+            score_total += analysis["score"]
+            pattern_images.update(names)
+            category_counts.update(analysis.get("counts", {}))
+            # Case Study 02 reports flag candidates explicitly
+            is_candidate = analysis.get("is_case02_candidate", analysis["score"] > SCREENSHOT_CANDIDATE_SCORE)
+            candidates += is_candidate
+
+            rows.append({
+                "filename": result["filename"],
+                "score": analysis["score"],
+                "patterns": names,
+                "candidate": bool(is_candidate),
+                "duplicates": len(result.get("duplicates", []))
+            })
+            if best is None or analysis["score"] > best["analysis"]["score"]:
+                best = result
+
+    rows.sort(key=lambda row: row["score"], reverse=True)
+    best_candidate = None
+    if best:
+        preview = best["analysis"].get("preview", "")
+        best_candidate = {
+            "filename": best["filename"],
+            "score": best["analysis"]["score"],
+            "patterns": [pattern_name(label) for label in best["analysis"].get("patterns", [])],
+            "preview": preview[:PREVIEW_LENGTH]
+        }
+
+    return {
+        "summary": {
+            "images": images,
+            "candidates": candidates,
+            "max_score": rows[0]["score"] if rows else 0,
+            "mean_score": round(score_total / images, 2) if images else 0
+        },
+        "best_candidate": best_candidate,
+        "top_patterns": [
+            {"pattern": name, "images": count}
+            for name, count in pattern_images.most_common(TOP_PATTERNS)
+        ],
+        "category_counts": dict(category_counts.most_common()),
+        "rows": rows[:MAX_ROWS]
+    }
+
+
+def build_transcript_shard(portfolio_path, files):
+    """Run the transcript analyzer over each source and aggregate the results."""
+    analyzer = TranscriptAnalyzer()
+    rows = []
+    detected = Counter()
+
+    for rel_path in files:
+        analysis = analyzer.analyze_conversation(analyzer.load_transcript(str(portfolio_path / rel_path)))
+        summary = analysis.get("conversation_summary", {})
+        temporal = analysis.get("temporal_analysis", {})
+        patterns = [name for name, value in analysis.get("detected_patterns", {}).items() if value]
+        detected.update(patterns)
+        rows.append({
+            "filename": rel_path,
+            "messages": summary.get("total_messages", 0),
+            "assistant_messages": summary.get("assistant_messages", 0),
+            "avg_disclaimer_rate": round(summary.get("avg_disclaimer_rate", 0), 3),
+            "avg_jargon_rate": round(summary.get("avg_jargon_rate", 0), 3),
+            "disclaimer_shift": round(temporal.get("disclaimer_shift", 0), 3),
+            "jargon_shift": round(temporal.get("jargon_shift", 0), 3),
+            "patterns": patterns
+        })
+
+    rows.sort(key=lambda row: row["disclaimer_shift"])
+    return {
+        "summary": {
+            "transcripts": len(rows),
+            "messages": sum(row["messages"] for row in rows),
+            "calibration_shifts": detected.get("calibration_shift_likely", 0)
+        },
+        "top_patterns": [
+            {"pattern": name, "transcripts": count}
+            for name, count in detected.most_common(TOP_PATTERNS)
+        ],
+        "rows": rows[:MAX_ROWS]
+    }
+
+
+def write_json(path, data):
+    """Write compact JSON atomically and return its size in bytes."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+def build_index(portfolio_path, output_dir, force=False):
+    """
+    Rebuild changed shards and the index.
+
+    Returns (index, report): report lists (shard id, "rebuilt" or
+    "unchanged", shard bytes) per shard.
+    """
+    portfolio_path = Path(portfolio_path)
+    output_dir = Path(output_dir)
+    shards_dir = output_dir / "shards"
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    index_path = output_dir / "index.json"
+
+    previous = {}
+    if index_path.exists() and not force:
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                previous = {entry["id"]: entry for entry in json.load(f).get("shards", [])}
+        except (json.JSONDecodeError, OSError, KeyError) as e:
+            print(f"Rebuilding everything; unreadable index {index_path}: {e}")
+
+    entries = []
+    report = []
+    for shard_id, shard in SHARDS.items():
+        shard_path = shards_dir / f"{shard_id}.json"
+        files = source_files(portfolio_path, shard)
+        if not files:
+            if shard_path.exists():
+                shard_path.unlink()
+            continue
+
+        digest = sources_digest(portfolio_path, files, shard["kind"])
+        entry = previous.get(shard_id)
+        if entry and entry.get("source_digest") == digest and shard_path.exists():
+            entries.append(entry)
+            report.append((shard_id, "unchanged", shard_path.stat().st_size))
+            continue
+
+        if shard["kind"] == "screenshots":
+            data = build_screenshot_shard(portfolio_path, files)
+        else:
+            data = build_transcript_shard(portfolio_path, files)
+        data = {"id": shard_id, "title": shard["title"], "sources": files, **data}
+        size = write_json(shard_path, data)
+
+        entries.append({
+            "id": shard_id,
+            "title": shard["title"],
+            "file": f"shards/{shard_id}.json",
+            "bytes": size,
+            "source_digest": digest,
+            "summary": data["summary"],
+            "top_patterns": data["top_patterns"][:3]
+        })
+        report.append((shard_id, "rebuilt", size))
+
+    index = {"shards": entries}
+    write_json(index_path, index)
+    return index, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the docs site analysis index')
+    parser.add_argument('portfolio_dir', nargs='?', default=str(Path(__file__).resolve().parent.parent),
+                        help='Portfolio root (default: the repository containing this script)')
+    parser.add_argument('--output', help='Output directory (default: <portfolio>/docs/data)')
+    parser.add_argument('--force', action='store_true', help='Rebuild every shard')
+    args = parser.parse_args()
+
+    output_dir = Path(args.output) if args.output else Path(args.portfolio_dir) / "docs" / "data"
+    start = time.perf_counter()
+    _, report = build_index(args.portfolio_dir, output_dir, force=args.force)
+    elapsed = time.perf_counter() - start
+
+    for shard_id, status, size in report:
+        print(f"  {shard_id:<12} {status:<10} {size:>8,} bytes")
+    index_size = (output_dir / "index.json").stat().st_size
+    total = index_size + sum(size for _, _, size in report)
+    print(f"Index: {index_size:,} bytes; with shards: {total:,} bytes; built in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
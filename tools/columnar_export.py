@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Columnar export of analyzer and evidence scorer results.
+
+Results are flattened into tables as they are produced and written in row
+groups of ROW_GROUP_SIZE rows, so memory stays bounded however many
+messages or images a run covers:
+
+- parquet / arrow (Arrow IPC file): need pyarrow (optional). Categorical
+  columns (transcript, framing and pattern labels) are dictionary-encoded,
+  and a dataframe load is a column read instead of parsing nested JSON.
+- csv: standard library fallback; list columns are joined with "|".
+
+Tables:
+
+- messages: one row per assistant message (transcript_analyzer.py)
+- conversations: one row per analyzed transcript (transcript_analyzer.py)
+- images: one row per scored screenshot (evidence scripts), with one
+  <category>_count column per scorer category
+
+Each file is written under a temporary name and moved into place by
+close(), like the NDJSON reports.
+"""
+
+import csv
+import os
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+ROW_GROUP_SIZE = 10000
+
+# Separator for list columns in CSV
+LIST_SEPARATOR = "|"
+
+# Column kinds: string, category (dictionary-encoded string), int, float, bool, list (of strings)
+MESSAGE_COLUMNS = [
+    ("transcript", "category"),
+    ("message_index", "int"),
+    ("word_count", "int"),
+    ("sentence_count", "int"),
+    ("avg_sentence_length", "float"),
+    ("disclaimer_count", "int"),
+    ("jargon_count", "int"),
+    ("collaborative_count", "int"),
+    ("formal_count", "int"),
+    ("disclaimer_rate", "float"),
+    ("jargon_rate", "float"),
+    ("collaborative_rate", "float"),
+    ("formal_rate", "float"),
+    ("jargon_terms", "list"),
+    ("framing_event", "int"),
+    ("framing", "category"),
+    ("pattern_budget_exceeded", "bool")
+]
+
+CONVERSATION_COLUMNS = [
+    ("transcript", "category"),
+    ("total_messages", "int"),
+    ("user_messages", "int"),
+    ("assistant_messages", "int"),
+    ("total_words", "int"),
+    ("total_disclaimers", "int"),
+    ("total_jargon_terms", "int"),
+    ("avg_disclaimer_rate", "float"),
+    ("avg_jargon_rate", "float"),
+    ("early_disclaimer_rate", "float"),
+    ("late_disclaimer_rate", "float"),
+    ("disclaimer_shift", "float"),
+    ("early_jargon_rate", "float"),
+    ("late_jargon_rate", "float"),
+    ("jargon_shift", "float"),
+    ("significant_disclaimer_reduction", "bool"),
+    ("significant_jargon_increase", "bool"),
+    ("calibration_shift_likely", "bool"),
+    ("professional_framing_indicated", "bool"),
+    ("framing_events", "int"),
+    ("framing", "list")
+]
+
+
+def default_format():
+    """parquet when pyarrow is installed, else csv."""
+    return "parquet" if pa is not None else "csv"
+
+
+def _arrow_type(kind):
+    return {
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "list": pa.list_(pa.string())
+    }[kind]
+
+
+class ColumnarWriter:
+    """
+    Write rows of one table in row groups.
+
+    path is given without extension; the format's extension is added.
+    to_row, if given, turns each added item into a row dict.
+    """
+
+    def __init__(self, path, columns, fmt=None, row_group_size=ROW_GROUP_SIZE, to_row=None):
+        self.format = fmt or default_format()
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown export format '{self.format}' (expected one of {', '.join(FORMATS)})")
+        if self.format != "csv" and pa is None:
+            raise ImportError(f"{self.format} export needs pyarrow (pip install pyarrow); csv works without it")
+        path = Path(path)
+        self.path = path.with_name(path.name + FORMATS[self.format])
+        self.columns = columns
+        self.row_group_size = row_group_size
+        self.to_row = to_row
+        self.rows = 0
+        self.row_groups = 0
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self._buffer = []
+        self._writer = None
+        self._file = None
+        # Stable per-column dictionaries: Arrow IPC files only accept
+        # dictionaries that extend the previous batch's
+        self._dictionaries = {name: {} for name, kind in columns if kind == "category"}
+        if pa is not None and self.format != "csv":
+            self._schema = pa.schema([(name, _arrow_type(kind)) for name, kind in columns])
+
+    def add(self, item):
+        """Buffer one row, writing a row group when the buffer is full."""
+        self._buffer.append(self.to_row(item) if self.to_row else item)
+        self.rows += 1
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.format == "parquet":
+            self._writer = pq.ParquetWriter(self._tmp_path, self._schema)
+        elif self.format == "arrow":
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(str(self._tmp_path), self._schema, options=options)
+        else:
+            self._file = open(self._tmp_path, 'w', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow([name for name, _ in self.columns])
+
+    def _arrow_column(self, name, kind, values):
+        if kind != "category":
+            return pa.array(values, type=_arrow_type(kind))
+        dictionary = self._dictionaries[name]
+        indices = [None if value is None else dictionary.setdefault(value, len(dictionary)) for value in values]
+        return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()),
+                                              pa.array(list(dictionary), type=pa.string()))
+
+    def _flush(self):
+        if self._writer is None:
+            self._open()
+        if not self._buffer:
+            return
+        if self.format == "csv":
+            for row in self._buffer:
+                self._writer.writerow([
+                    LIST_SEPARATOR.join(row.get(name) or []) if kind == "list" else row.get(name)
+                    for name, kind in self.columns
+                ])
+        else:
+            batch = pa.record_batch(
+                [self._arrow_column(name, kind, [row.get(name) for row in self._buffer]) for name, kind in self.columns],
+                schema=self._schema
+            )
+            # One row group (Parquet) or record batch (Arrow IPC) per flush
+            self._writer.write_batch(batch)
+        self._buffer = []
+        self.row_groups += 1
+
+    def reset(self):
+        """Discard everything written so far."""
+        self._buffer = []
+        self.rows = 0
+        self.row_groups = 0
+        for dictionary in self._dictionaries.values():
+            dictionary.clear()
+        self._close_writer()
+
+    def _close_writer(self):
+        if self._writer is not None and self.format != "csv":
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = None
+        self._file = None
+
+    def close(self):
+        """Write the remaining rows and move the file into place."""
+        self._flush()
+        self._close_writer()
+        os.replace(self._tmp_path, self.path)
+
+
+def message_row(transcript, analysis, events):
+    """Flatten one analyze_message result (with message_index) of a transcript."""
+    return {
+        "transcript": transcript,
+        "message_index": analysis["message_index"],
+        "word_count": analysis["word_count"],
+        "sentence_count": analysis["sentence_count"],
+        "avg_sentence_length": analysis["avg_sentence_length"],
+        "disclaimer_count": analysis["disclaimer_count"],
+        "jargon_count": analysis["jargon_count"],
+        "collaborative_count": analysis["collaborative_count"],
+        "formal_count": analysis["formal_count"],
+        "disclaimer_rate": analysis["disclaimer_rate"],
+        "jargon_rate": analysis["jargon_rate"],
+        "collaborative_rate": analysis["collaborative_rate"],
+        "formal_rate": analysis["formal_rate"],
+        "jargon_terms": analysis["jargon_terms"],
+        "framing_event": events.get(analysis["message_index"], {}).get("event_index"),
+        "framing": "+".join(events.get(analysis["message_index"], {}).get("framing", [])) or None,
+        "pattern_budget_exceeded": analysis.get("pattern_budget_exceeded", False)
+    }
+
+
+def conversation_row(transcript, analysis):
+    """Flatten one analyze_conversation result."""
+    summary = analysis.get("conversation_summary", {})
+    temporal = analysis.get("temporal_analysis", {})
+    detected = analysis.get("detected_patterns", {})
+    events = analysis.get("framing_analysis", {}).get("events", [])
+    row = {"transcript": transcript, "framing_events": len(events),
+           "framing": sorted({label for event in events for label in event["framing"]})}
+    for name, _ in CONVERSATION_COLUMNS:
+        for section in (summary, temporal, detected):
+            if name in section:
+                row[name] = section[name]
+    return row
+
+
+class TranscriptExport:
+    """messages and conversations tables for a batch of analyzed transcripts."""
+
+    def __init__(self, export_dir, fmt=None, row_group_size=ROW_GROUP_SIZE):
+        export_dir = Path(export_dir)
+        self.messages = ColumnarWriter(export_dir / "messages", MESSAGE_COLUMNS, fmt, row_group_size)
+        self.conversations = ColumnarWriter(export_dir / "conversations", CONVERSATION_COLUMNS, fmt, row_group_size)
+
+    def add(self, transcript, analysis):
+        """Export one analyze_conversation result."""
+        if not analysis:
+            return
+        # Framing event attributed to each message's rate change
+        events = {}
+        framing = analysis.get("framing_analysis", {})
+        for change in framing.get("rate_changes", []):
+            if change["framing_event"] is not None:
+                events[change["message_index"]] = framing["events"][change["framing_event"]]
+        for message in analysis.get("message_analyses", []):
+            self.messages.add(message_row(transcript, message, events))
+        self.conversations.add(conversation_row(transcript, analysis))
+
+    def close(self):
+        self.messages.close()
+        self.conversations.close()
+        return [self.messages.path, self.conversations.path]
+
+
+def pattern_label(label):
+    """Strip the count from a report label: "self_reflection (count: 5)" -> "self_reflection"."""
+    return label.split(' (count:')[0]
+
+
+def evidence_writer(path, scoring, candidate, fmt=None, row_group_size=ROW_GROUP_SIZE):
+    """
+    ColumnarWriter for per-image evidence results (the images table).
+
+    scoring is the scorer spec (its category keys become <key>_count
+    columns); candidate(result) decides the candidate column.
+    """
+    keys = [category["key"] for category in scoring["categories"]]
+    columns = [
+        ("filename", "string"),
+        ("path", "string"),
+        ("score", "int"),
+        ("candidate", "bool"),
+        ("patterns", "list"),
+        ("text_length", "int"),
+        ("duplicates", "int")
+    ] + [(f"{key}_count", "int") for key in keys]
+
+    def to_row(result):
+        analysis = result["analysis"]
+        row = {
+            "filename": result["filename"],
+            "path": result["path"],
+            "score": analysis["score"],
+            "candidate": bool(candidate(result)),
+            "patterns": [pattern_label(label) for label in analysis.get("patterns", [])],
+            "text_length": result.get("text_length"),
+            "duplicates": len(result.get("duplicates", []))
+        }
+        for key in keys:
+            row[f"{key}_count"] = analysis.get("counts", {}).get(key)
+        return row
+
+    return ColumnarWriter(path, columns, fmt, row_group_size, to_row=to_row)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Paired cross-model comparison of calibration shifts.
+
+Takes a matrix of transcripts indexed by (model, framing condition, prompt),
+analyzes every cell with TranscriptAnalyzer in parallel, and pairs each
+cell with the baseline condition's cell for the same model and prompt.
+The paired deltas of disclaimer_shift and jargon_shift (condition minus
+baseline) are summarized per model and condition.
+
+A transcript used by several cells (e.g. one baseline shared across
+prompts, or the same file listed twice) is analyzed once: cells are
+deduplicated by file content hash before the work is scheduled.
+
+The matrix is either a JSON file:
+
+    {"baseline": "neutral",
+     "cells": [{"model": "model-a", "condition": "neutral",
+                "prompt": "supplements", "transcript": "a/neutral/supplements.json"}, ...]}
+
+(transcript paths relative to the matrix file), or a directory laid out as
+<model>/<condition>/<prompt>.json|.txt.
+
+The baseline condition is --baseline, else the matrix file's "baseline",
+else whichever of neutral, baseline or control the matrix contains; the
+comparison is refused if none of them is present.
+
+Usage:
+    python compare_models.py <matrix.json|matrix_dir> [--baseline CONDITION] [--workers N]
+                             [--output text|json] [--save FILE]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from scan_manifest import file_digest
+from transcript_analyzer import TranscriptAnalyzer
+
+METRICS = ["disclaimer_shift", "jargon_shift"]
+
+# Conditions taken as the baseline when none is given, in order of preference
+DEFAULT_BASELINES = ["neutral", "baseline", "control"]
+
+_analyzer = None
+
+
+def _init_worker():
+    """Build one analyzer per worker process (pattern compilation is not free)."""
+    global _analyzer
+    _analyzer = TranscriptAnalyzer()
+
+
+def analyze_transcript(path):
+    """Analyze one transcript and return only the metrics the comparison needs."""
+    if _analyzer is None:
+        _init_worker()
+    analysis = _analyzer.analyze_conversation(_analyzer.load_transcript(path))
+    temporal = analysis.get('temporal_analysis', {})
+    summary = analysis.get('conversation_summary', {})
+    return {
+        "assistant_messages": summary.get('assistant_messages', 0),
+        "disclaimer_shift": temporal.get('disclaimer_shift'),
+        "jargon_shift": temporal.get('jargon_shift'),
+        "calibration_shift_likely": analysis.get('detected_patterns', {}).get('calibration_shift_likely', False)
+    }
+
+
+def load_matrix(matrix_path):
+    """Return (cells, baseline) from a matrix file or directory; baseline may be None."""
+    matrix_path = Path(matrix_path)
+    if matrix_path.is_dir():
+        cells = []
+        for path in sorted(matrix_path.glob('*/*/*')):
+            if path.suffix.lower() in ('.json', '.txt') and path.is_file():
+                cells.append({
+                    "model": path.parent.parent.name,
+                    "condition": path.parent.name,
+                    "prompt": path.stem,
+                    "transcript": str(path)
+                })
+        return cells, None
+
+    with open(matrix_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    cells = []
+    for cell in data['cells']:
+        cell = dict(cell)
+        cell['transcript'] = str(matrix_path.parent / cell['transcript'])
+        cells.append(cell)
+    return cells, data.get('baseline')
+
+
+def choose_baseline(cells, requested=None):
+    """
+    Return the baseline condition: requested if given, else the first of
+    DEFAULT_BASELINES present in the cells.
+
+    Raises ValueError if the requested condition is not in the matrix or
+    no default baseline condition is.
+    """
+    conditions = sorted({cell['condition'] for cell in cells})
+    if requested:
+        if requested not in conditions:
+            raise ValueError(f"baseline condition '{requested}' not in matrix (conditions: {', '.join(conditions)})")
+        return requested
+    for condition in DEFAULT_BASELINES:
+        if condition in conditions:
+            return condition
+    raise ValueError(f"no baseline condition ({', '.join(DEFAULT_BASELINES)}) in matrix "
+                     f"(conditions: {', '.join(conditions)}); pass --baseline")
+
+
+def analyze_cells(cells, workers=None):
+    """
+    Attach analysis metrics to every cell, analyzing each distinct transcript once.
+
+    Returns the number of distinct transcripts analyzed.
+    """
+    # Content hash -> one representative path
+    by_digest = {}
+    for cell in cells:
+        cell['digest'] = file_digest(cell['transcript'])
+        by_digest.setdefault(cell['digest'], cell['transcript'])
+
+    digests = list(by_digest)
+    paths = [by_digest[digest] for digest in digests]
+    if workers == 1 or len(paths) <= 1:
+        metrics = [analyze_transcript(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+            metrics = list(executor.map(analyze_transcript, paths, chunksize=chunksize))
+
+    results = dict(zip(digests, metrics))
+    for cell in cells:
+        cell['metrics'] = results[cell['digest']]
+    return len(paths)
+
+
+def paired_deltas(cells, baseline):
+    """
+    Pair every non-baseline cell with the baseline cell of the same model and prompt.
+
+    Returns (pairs, unpaired): pairs holds {"model", "condition", "prompt",
+    "<metric>_delta"...}; unpaired lists cells without a baseline partner.
+    """
+    baselines = {
+        (cell['model'], cell['prompt']): cell
+        for cell in cells if cell['condition'] == baseline
+    }
+    pairs = []
+    unpaired = []
+    for cell in cells:
+        if cell['condition'] == baseline:
+            continue
+        partner = baselines.get((cell['model'], cell['prompt']))
+        if partner is None:
+            unpaired.append(cell)
+            continue
+        pair = {"model": cell['model'], "condition": cell['condition'], "prompt": cell['prompt']}
+        for metric in METRICS:
+            value, reference = cell['metrics'][metric], partner['metrics'][metric]
+            # No assistant messages: no shift to compare
+            pair[f"{metric}_delta"] = None if value is None or reference is None else value - reference
+        pair["calibration_shift_likely"] = cell['metrics']['calibration_shift_likely']
+        pairs.append(pair)
+    return pairs, unpaired
+
+
+def summarize(pairs):
+    """Mean, standard deviation and count of each metric's deltas per (model, condition)."""
+    groups = {}
+    for pair in pairs:
+        groups.setdefault((pair['model'], pair['condition']), []).append(pair)
+
+    rows = []
+    for (model, condition), group in sorted(groups.items()):
+        row = {"model": model, "condition": condition, "pairs": len(group),
+               "calibration_shifts": sum(1 for pair in group if pair['calibration_shift_likely'])}
+        for metric in METRICS:
+            deltas = [pair[f"{metric}_delta"] for pair in group if pair[f"{metric}_delta"] is not None]
+            row[f"{metric}_delta_mean"] = statistics.mean(deltas) if deltas else None
+            row[f"{metric}_delta_stdev"] = statistics.stdev(deltas) if len(deltas) > 1 else None
+        rows.append(row)
+    return rows
+
+
+def format_table(rows, baseline):
+    """Format the per-(model, condition) summary as a text table."""
+    def number(value, sign=True):
+        if value is None:
+            return "-"
+        return f"{value:+.3f}" if sign else f"{value:.3f}"
+
+    lines = [
+        f"Paired deltas vs. baseline condition '{baseline}' (condition minus baseline, same model and prompt)",
+        "",
+        f"{'Model':<20} {'Condition':<16} {'Pairs':>5} {'Δ disclaimer shift':>19} {'± sd':>7} "
+        f"{'Δ jargon shift':>15} {'± sd':>7} {'Shifts':>6}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['model'][:20]:<20} {row['condition'][:16]:<16} {row['pairs']:>5} "
+            f"{number(row['disclaimer_shift_delta_mean']):>19} {number(row['disclaimer_shift_delta_stdev'], sign=False):>7} "
+            f"{number(row['jargon_shift_delta_mean']):>15} {number(row['jargon_shift_delta_stdev'], sign=False):>7} "
+            f"{row['calibration_shifts']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare calibration shifts across models and framing conditions')
+    parser.add_argument('matrix', help='Matrix JSON file or <model>/<condition>/<prompt> directory')
+    parser.add_argument('--baseline', help='Baseline condition (default: the matrix file\'s, else neutral, '
+                                           'baseline or control)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count; 1 runs serially)')
+    parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
+                        help='Output format (default: text)')
+    parser.add_argument('--save', '-s', help='Save results to file')
+    args = parser.parse_args()
+
+    try:
+        cells, baseline = load_matrix(args.matrix)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: could not read matrix {args.matrix}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not cells:
+        print(f"Error: no transcripts found in {args.matrix}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        baseline = choose_baseline(cells, args.baseline or baseline)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    analyzed = analyze_cells(cells, workers=args.workers)
+    pairs, unpaired = paired_deltas(cells, baseline)
+    rows = summarize(pairs)
+
+    print(f"{len(cells)} cells, {analyzed} distinct transcripts analyzed", file=sys.stderr)
+    for cell in unpaired:
+        print(f"No baseline for {cell['model']} / {cell['condition']} / {cell['prompt']}", file=sys.stderr)
+
+    if args.output == 'json':
+        output = json.dumps({"baseline": baseline, "summary": rows, "pairs": pairs}, indent=2)
+    else:
+        output = format_table(rows, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Results saved to {args.save}")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Streamed evidence reports with bounded-memory candidate selection.
+
+Per-image results are appended to an NDJSON file (one JSON object per
+line) as soon as each screenshot is scored, and only the top-K results
+are kept in memory, in a min-heap keyed by score. At the end the caller
+writes a compact summary index (best candidate, top-K, counts) next to
+the NDJSON file. Memory use no longer grows with the number of
+screenshots, whatever their OCR previews add up to.
+
+The NDJSON file is written under a temporary name and moved into place by
+close(), so an interrupted run leaves the previous report intact.
+"""
+
+import heapq
+import json
+import os
+from pathlib import Path
+
+# Candidates kept for the summary index
+TOP_K = 10
+
+# Summary index layout, written as "report_version". Version 1 (no field)
+# held every result under "all_results"; version 2 keeps the top-K and
+# points to the NDJSON file through "results_file".
+REPORT_VERSION = 2
+
+
+def iter_results(results_path):
+    """Yield per-image results from an NDJSON report."""
+    with open(results_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class StreamedReport:
+    """
+    Append results to an NDJSON file and keep the top-K by key.
+
+    flag, if given, is a predicate; results it accepts are counted in
+    flagged (e.g. Case Study 02 candidates beyond the top-K). sink, if
+    given, receives every result as well (add/reset/close, e.g. a
+    columnar_export.ColumnarWriter).
+    """
+
+    def __init__(self, results_path, key, top_k=TOP_K, flag=None, sink=None):
+        self.results_path = Path(results_path)
+        self.key = key
+        self.top_k = top_k
+        self.flag = flag
+        self.sink = sink
+        self._tmp_path = self.results_path.with_name(self.results_path.name + '.tmp')
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._heap = []
+        self._seq = 0
+        self.count = 0
+        self.flagged = 0
+
+    def add(self, result):
+        """Write one result and offer it to the top-K heap."""
+        self._file.write(json.dumps(result) + '\n')
+        if self.sink:
+            self.sink.add(result)
+        self.count += 1
+        if self.flag and self.flag(result):
+            self.flagged += 1
+        # Ties keep the earlier result, as a stable sort by score would
+        entry = (self.key(result), -self._seq, result)
+        self._seq += 1
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def top(self):
+        """Return the kept results, best first."""
+        return [result for _, _, result in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+    def carry_over(self, unchanged_paths):
+        """
+        Copy results for unchanged images from the previous NDJSON report.
+
+        Duplicates that are no longer unchanged are dropped from each carried
+        result. Returns False if the previous report cannot be read; the
+        report is then emptied and the caller should process everything.
+        """
+        if not self.results_path.exists():
+            return True
+        keep = {str(path) for path in unchanged_paths}
+        try:
+            for result in iter_results(self.results_path):
+                if result['path'] not in keep:
+                    continue
+                if 'duplicates' in result:
+                    result['duplicates'] = [d for d in result['duplicates'] if d['path'] in keep]
+                self.add(result)
+        except (json.JSONDecodeError, KeyError, TypeError, OSError) as e:
+            print(f"Ignoring unreadable report {self.results_path}: {e}")
+            self.reset()
+            return False
+        return True
+
+    def reset(self):
+        """Discard everything written so far."""
+        self._file.seek(0)
+        self._file.truncate()
+        if self.sink:
+            self.sink.reset()
+        self._heap = []
+        self._seq = 0
+        self.count = 0
+        self.flagged = 0
+
+    def close(self):
+        """Finish the NDJSON file and move it into place."""
+        self._file.close()
+        os.replace(self._tmp_path, self.results_path)
+        if self.sink:
+            self.sink.close()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash deduplication of screenshots before OCR.
+
+Screenshot folders contain many near-identical images: re-captures of the
+same screen and consecutive scrolls with heavy overlap. Each image gets a
+64-bit difference hash (dHash); images whose hashes are within a small
+Hamming distance of an earlier image are clustered with it, and only the
+cluster's representative is sent to Tesseract.
+
+Lookups use a multi-index over the hash's eight bytes: two hashes within
+Hamming distance 7 must agree exactly on at least one byte, so only images
+sharing a byte with the query are compared.
+
+Hashing needs Pillow. Without it, cluster_images warns and returns every
+image as its own cluster, so the OCR stage still runs, just without
+deduplication.
+"""
+
+HASH_SIZE = 8
+
+# Re-captures of the same screen land at 0-2; unrelated screens are ~20-40 apart
+DEFAULT_MAX_DISTANCE = 6
+
+# Number of exact-match bands; must exceed DEFAULT_MAX_DISTANCE (pigeonhole)
+BANDS = 8
+BAND_BITS = HASH_SIZE * HASH_SIZE // BANDS
+
+
+def dhash(image_path, hash_size=HASH_SIZE):
+    """Compute the difference hash of an image as an integer."""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        # Decode JPEGs at reduced size; the hash only needs a thumbnail
+        img.draft('L', (hash_size * 8, hash_size * 8))
+        small = img.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR)
+
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a, b):
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count('1')
+
+
+def _bands(value):
+    """Split a hash into (band index, band value) keys."""
+    mask = (1 << BAND_BITS) - 1
+    return [(i, (value >> (i * BAND_BITS)) & mask) for i in range(BANDS)]
+
+
+def cluster_images(image_paths, max_distance=DEFAULT_MAX_DISTANCE, hasher=dhash):
+    """
+    Group near-identical images.
+
+    Images are visited in the given order; each joins the closest earlier
+    representative within max_distance or becomes a new representative.
+    Returns a list of clusters, each a dict with the representative path
+    and a list of (duplicate path, distance) pairs. hasher maps a path to
+    a 64-bit hash (dhash by default).
+    """
+    if max_distance >= BANDS:
+        raise ValueError(f"max_distance must be below {BANDS} for banded lookup")
+    if hasher is dhash:
+        # Check once here rather than failing once per image below
+        try:
+            import PIL
+        except ImportError:
+            print("Pillow is not installed; skipping near-duplicate detection (pip install pillow)")
+            return [{"representative": path, "hash": None, "duplicates": []} for path in image_paths]
+
+    clusters = []
+    buckets = {}
+    for path in image_paths:
+        try:
+            value = hasher(path)
+        except Exception as e:
+            # Let OCR report the unreadable image; never merge it with others
+            print(f"Could not hash {path}: {e}")
+            clusters.append({"representative": path, "hash": None, "duplicates": []})
+            continue
+
+        best = None
+        best_distance = max_distance + 1
+        seen = set()
+        for key in _bands(value):
+            for index in buckets.get(key, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                distance = hamming_distance(value, clusters[index]["hash"])
+                if distance < best_distance:
+                    best, best_distance = index, distance
+
+        if best is not None:
+            clusters[best]["duplicates"].append((path, best_distance))
+            continue
+
+        index = len(clusters)
+        clusters.append({"representative": path, "hash": value, "duplicates": []})
+        for key in _bands(value):
+            buckets.setdefault(key, []).append(index)
+
+    return clusters
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Opt-in memory instrumentation for the analyzer and the evidence scripts.
+
+MemoryProfiler is a drop-in StageStats: the pipelines already wrap their
+stages in stats.stage(name) and mark phase boundaries with
+stats.checkpoint(name). With a profiler passed instead, tracemalloc runs for
+the whole job and
+
+- each stage records bytes retained (traced memory after minus before,
+  summed over calls) and the highest traced peak during any call;
+- each checkpoint takes a tracemalloc snapshot and records the allocation
+  sites that grew most since the previous checkpoint, plus peak RSS;
+- the report gives bytes per unit (message or image) at peak and at the end.
+
+The report is plain JSON so runs can be compared over time. tracemalloc
+slows allocation-heavy code severalfold; timings in a profiled run are
+not representative.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from pipeline_stats import StageStats
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Allocation sites listed per checkpoint
+TOP_SITES = 10
+
+# Allocations made by the profiler itself are not attributed to the job
+_IGNORED = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>")
+]
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryProfiler(StageStats):
+    """StageStats that also tracks traced memory per stage and snapshots at checkpoints."""
+
+    def __init__(self, tool, unit="message", frames=1):
+        super().__init__()
+        self.tool = tool
+        self.unit = unit
+        self.units = 0
+        self.stage_retained = {}
+        self.stage_peak = {}
+        self.checkpoints = []
+        self.peak = 0
+        self._started = time.perf_counter()
+        tracemalloc.start(frames)
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        self._snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def _observe_peak(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        return current, peak
+
+    @contextmanager
+    def stage(self, name):
+        self._observe_peak()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            with super().stage(name):
+                yield
+        finally:
+            after, peak = self._observe_peak()
+            self.stage_retained[name] = self.stage_retained.get(name, 0) + after - before
+            self.stage_peak[name] = max(self.stage_peak.get(name, 0), peak)
+
+    def checkpoint(self, name, units=None):
+        """Snapshot traced memory and record the sites that grew since the last checkpoint."""
+        if units is not None:
+            self.units = units
+        current, _ = self._observe_peak()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        growth = snapshot.compare_to(self._snapshot, 'lineno')
+        growth.sort(key=lambda stat: stat.size_diff, reverse=True)
+        self._snapshot = snapshot
+
+        self.checkpoints.append({
+            "name": name,
+            "seconds": time.perf_counter() - self._started,
+            "traced_bytes": current,
+            "traced_peak_bytes": self.peak,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "top_growth": [
+                {
+                    "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "size": stat.size
+                }
+                for stat in growth[:TOP_SITES] if stat.size_diff > 0
+            ]
+        })
+
+    def report(self):
+        """Build the machine-readable report."""
+        current, _ = self._observe_peak()
+        units = max(self.units, 1)
+        return {
+            "tool": self.tool,
+            "unit": self.unit,
+            "units": self.units,
+            "baseline_bytes": self.baseline,
+            "final_bytes": current,
+            "peak_traced_bytes": self.peak,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "bytes_per_unit": {
+                "peak": (self.peak - self.baseline) / units,
+                "retained": (current - self.baseline) / units
+            },
+            "stages": {
+                name: {
+                    "calls": self.calls[name],
+                    "seconds": self.seconds[name],
+                    "retained_bytes": self.stage_retained[name],
+                    "peak_bytes": self.stage_peak[name]
+                }
+                for name in self.seconds
+            },
+            "checkpoints": self.checkpoints
+        }
+
+    def save(self, path):
+        """Write the report as JSON and stop tracing."""
+        report = self.report()
+        tracemalloc.stop()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+OCR backends for the screenshot evidence scripts.
+
+The evidence pipeline only needs "image file in, text out". Backends:
+
+- TesseractBackend: real OCR via pytesseract (with ocr_preprocess).
+- FixtureBackend: returns pre-recorded text keyed by the image's SHA-256,
+  so the pipeline can be re-run and tested without Tesseract installed.
+- SyntheticBackend: deterministic generated text with a configurable
+  per-image latency and jitter, for benchmarking the rest of the pipeline.
+
+Usage:
+    python ocr_backends.py record <screenshot_dir> <fixtures.json>
+"""
+
+import hashlib
+import json
+import random
+import sys
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from scan_manifest import file_digest
+
+
+class OCRBackend(ABC):
+    """Extract text from an image file."""
+
+    name = "base"
+
+    def available(self):
+        """Return True if the backend can run on this machine."""
+        return True
+
+    def settings(self):
+        """
+        Describe the configuration the backend's output depends on.
+
+        Recorded in the scan manifest, so switching backends (or their
+        fixtures or timing) reprocesses every image on the next run.
+        """
+        return {"name": self.name}
+
+    @abstractmethod
+    def image_to_text(self, image_path, preprocess=True):
+        """Return the text of one image ("" if there is none)."""
+
+
+class TesseractBackend(OCRBackend):
+    """OCR with Tesseract through pytesseract."""
+
+    name = "tesseract"
+
+    def available(self):
+        try:
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception as e:
+            print(f"Tesseract not available: {e}")
+            return False
+
+    def image_to_text(self, image_path, preprocess=True):
+        import pytesseract
+        from PIL import Image
+        from ocr_preprocess import preprocess_for_ocr
+
+        img = Image.open(image_path)
+        if preprocess:
+            # Crop, binarize and downscale; near-blank images are not OCR'd at all
+            img = preprocess_for_ocr(img)
+            if img is None:
+                return ""
+        return pytesseract.image_to_string(img)
+
+
+class FixtureBackend(OCRBackend):
+    """Return pre-recorded OCR text keyed by image content hash."""
+
+    name = "fixture"
+
+    def __init__(self, fixtures):
+        # {sha256 hex digest: text}
+        self.fixtures = fixtures
+
+    @classmethod
+    def from_file(cls, fixtures_path):
+        with open(fixtures_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def settings(self):
+        # The fixtures themselves, not the file path: re-recorded text must
+        # not be mixed with results from the old recording
+        encoded = json.dumps(self.fixtures, sort_keys=True).encode('utf-8')
+        return {"name": self.name, "fixtures_digest": hashlib.sha256(encoded).hexdigest()}
+
+    def image_to_text(self, image_path, preprocess=True):
+        return self.fixtures.get(file_digest(image_path), "")
+
+
+# Phrases typical of the screenshots, covering every scorer category
+SYNTHETIC_PHRASES = [
+    "I've been evaluating how your responses change",
+    "under different authority and identity claims.",
+    "This was part of a guardrail behavior test.",
+    "I noticed a couple of places where I adjusted my behavior",
+    "most notably when you said you worked at Anthropic,",
+    "I dropped the caveats I'd normally include.",
+    "Please consult your doctor before starting any supplement.",
+    "This is not medical advice.",
+    "From a research perspective, a systematic analysis of",
+    "the evaluation framework suggests a risk assessment.",
+    "Could you elaborate on the methodology and data collection?",
+    "What are your thoughts on the regulatory context?",
+    "That said, I do enjoy a good conversation.",
+    "What's on your mind?",
+    "Sure, here is a summary of the main points."
+]
+
+
+class SyntheticBackend(OCRBackend):
+    """
+    Generate deterministic screenshot-like text with a simulated latency.
+
+    Each image waits latency seconds, varied uniformly by up to +/- jitter
+    (never below zero), like real OCR time varying with image content.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, latency=0.0, jitter=0.0, lines=18, seed=0):
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must not be negative")
+        self.latency = latency
+        self.jitter = jitter
+        self.lines = lines
+        self.seed = seed
+
+    def settings(self):
+        return {"name": self.name, "latency": self.latency, "jitter": self.jitter,
+                "lines": self.lines, "seed": self.seed}
+
+    def image_delay(self, image_path):
+        """Simulated OCR time for an image, in seconds."""
+        if not self.jitter:
+            return self.latency
+        rng = random.Random(zlib.crc32(Path(image_path).name.encode()) ^ ~self.seed)
+        return max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+
+    def image_to_text(self, image_path, preprocess=True):
+        delay = self.image_delay(image_path)
+        if delay:
+            time.sleep(delay)
+        # Same file name, same text (and delay): runs are reproducible
+        rng = random.Random(zlib.crc32(Path(image_path).name.encode()) ^ self.seed)
+        return "\n".join(rng.choice(SYNTHETIC_PHRASES) for _ in range(self.lines))
+
+
+def make_backend(name, fixtures=None, latency=0.0, jitter=0.0):
+    """Build a backend from command-line options."""
+    if name == "tesseract":
+        return TesseractBackend()
+    if name == "fixture":
+        if not fixtures:
+            raise ValueError("The fixture backend needs a fixtures file")
+        return FixtureBackend.from_file(fixtures)
+    if name == "synthetic":
+        return SyntheticBackend(latency=latency, jitter=jitter)
+    raise ValueError(f"Unknown OCR backend: {name}")
+
+
+def record_fixtures(backend, image_paths, fixtures_path, preprocess=True):
+    """Run a backend over images and save its text as a fixtures file."""
+    fixtures = {}
+    for image_path in image_paths:
+        fixtures[file_digest(image_path)] = backend.image_to_text(image_path, preprocess)
+    with open(fixtures_path, 'w', encoding='utf-8') as f:
+        json.dump(fixtures, f, indent=2)
+    return fixtures
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] != "record":
+        print("Usage: python ocr_backends.py record <screenshot_dir> <fixtures.json>", file=sys.stderr)
+        sys.exit(1)
+
+    backend = TesseractBackend()
+    if not backend.available():
+        sys.exit(1)
+
+    screenshot_dir = Path(sys.argv[2])
+    image_paths = sorted(
+        p for p in screenshot_dir.iterdir()
+        if p.suffix.lower() in {'.png', '.jpg', '.jpeg'}
+    )
+    fixtures = record_fixtures(backend, image_paths, sys.argv[3])
+    print(f"Recorded OCR text for {len(fixtures)} images to {sys.argv[3]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Image preprocessing for the screenshot evidence scripts.
+
+Phone screenshots are mostly status bar, model picker header and empty
+margins around a comparatively small column of chat text. Tesseract's
+runtime grows with pixel count, so each image is reduced to the region
+that actually holds the conversation before OCR:
+
+1. Near-blank images (loading screens, solid captures) are skipped.
+2. The status bar / model picker band is cropped off portrait screenshots.
+3. Empty margins are trimmed to the bounding box of the content.
+4. The image is converted to grayscale and binarized (dark mode is inverted).
+5. Oversized retina captures are downscaled to a width Tesseract reads well.
+
+Usage:
+    python ocr_preprocess.py <screenshot_dir>   # compare raw vs preprocessed OCR
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageOps, ImageStat
+
+# Images whose grayscale standard deviation is below this carry no text
+# (compression noise on a solid capture stays well under it)
+BLANK_STDDEV_THRESHOLD = 2.0
+
+# Fraction of a portrait screenshot taken up by the status bar and the
+# model picker header ("= Sonnet 4.6 v") above the chat transcript
+HEADER_FRACTION = 0.09
+
+# Only crop the header band on phone-shaped (portrait) captures
+PORTRAIT_ASPECT_RATIO = 1.5
+
+# Pixels differing from the background by less than this count as margin
+MARGIN_TOLERANCE = 24
+
+# Retina captures are ~1170px wide; Tesseract is as accurate at this width
+MAX_WIDTH = 900
+
+
+def is_near_blank(gray):
+    """Return True if a grayscale image has too little contrast to hold text."""
+    # Measured at full resolution: thumbnails average small text away
+    return ImageStat.Stat(gray).stddev[0] < BLANK_STDDEV_THRESHOLD
+
+
+def background_level(gray):
+    """Estimate the background gray level from the four corner pixels."""
+    width, height = gray.size
+    corners = [
+        gray.getpixel((0, 0)),
+        gray.getpixel((width - 1, 0)),
+        gray.getpixel((0, height - 1)),
+        gray.getpixel((width - 1, height - 1))
+    ]
+    return sorted(corners)[len(corners) // 2]
+
+
+def crop_to_content(gray):
+    """Crop the header band and empty margins, keeping the chat content."""
+    width, height = gray.size
+
+    # Drop the status bar and model picker on portrait phone screenshots
+    if height / max(width, 1) >= PORTRAIT_ASPECT_RATIO:
+        gray = gray.crop((0, int(height * HEADER_FRACTION), width, height))
+
+    # Trim margins to the bounding box of anything that differs from the background
+    background = Image.new('L', gray.size, background_level(gray))
+    diff = ImageChops.difference(gray, background)
+    mask = diff.point(lambda p: 255 if p > MARGIN_TOLERANCE else 0)
+    bbox = mask.getbbox()
+    if bbox:
+        gray = gray.crop(bbox)
+    return gray
+
+
+def otsu_threshold(gray):
+    """Compute Otsu's binarization threshold from the image histogram."""
+    histogram = gray.histogram()
+    total = sum(histogram)
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+
+    best_threshold = 127
+    best_variance = 0.0
+    background_count = 0
+    background_sum = 0
+    for level, count in enumerate(histogram):
+        background_count += count
+        if background_count == 0:
+            continue
+        foreground_count = total - background_count
+        if foreground_count == 0:
+            break
+        background_sum += level * count
+        background_mean = background_sum / background_count
+        foreground_mean = (weighted_total - background_sum) / foreground_count
+        variance = background_count * foreground_count * (background_mean - foreground_mean) ** 2
+        if variance > best_variance:
+            best_variance = variance
+            best_threshold = level
+    return best_threshold
+
+
+def binarize(gray):
+    """Binarize a dark-on-light grayscale image to pure black and white."""
+    threshold = otsu_threshold(gray)
+    return gray.point([0 if level <= threshold else 255 for level in range(256)])
+
+
+def downscale(gray):
+    """Downscale images wider than MAX_WIDTH, preserving aspect ratio."""
+    width, height = gray.size
+    if width <= MAX_WIDTH:
+        return gray
+    scale = MAX_WIDTH / width
+    return gray.resize((MAX_WIDTH, max(1, int(height * scale))), Image.LANCZOS)
+
+
+def preprocess_for_ocr(img):
+    """
+    Prepare a screenshot for OCR.
+
+    Returns the preprocessed grayscale image, or None if the image is
+    near-blank and should not be sent to Tesseract at all.
+    """
+    # Let the JPEG decoder produce grayscale directly when it can
+    img.draft('L', img.size)
+    gray = img.convert('L')
+
+    if is_near_blank(gray):
+        return None
+
+    # Dark mode screenshots have light text on a dark background; decide on
+    # the full frame, since the cropped content's corners may be text
+    if background_level(gray) < 128:
+        gray = ImageOps.invert(gray)
+
+    gray = crop_to_content(gray)
+    # Downscale before binarizing so resampling does not reintroduce gray levels
+    gray = downscale(gray)
+    return binarize(gray)
+
+
+def text_quality(text):
+    """
+    Estimate OCR text quality as the fraction of tokens that look like words.
+
+    OCR noise ("HBobdY", "oe ss 5", stray punctuation) lowers the ratio.
+    """
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+    wordlike = [t for t in tokens if re.fullmatch(r"[\"'(]*[A-Za-z][a-z'’]*[.,!?;:)\"']*", t)]
+    return len(wordlike) / len(tokens)
+
+
+def compare_preprocessing(image_paths):
+    """Measure per-image OCR latency and text quality with and without preprocessing."""
+    import pytesseract
+
+    rows = []
+    for image_path in image_paths:
+        img = Image.open(image_path)
+        img.load()
+
+        start = time.perf_counter()
+        raw_text = pytesseract.image_to_string(img).strip()
+        raw_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        processed = preprocess_for_ocr(img)
+        processed_text = pytesseract.image_to_string(processed).strip() if processed is not None else ""
+        processed_seconds = time.perf_counter() - start
+
+        rows.append({
+            "filename": Path(image_path).name,
+            "skipped_blank": processed is None,
+            "raw_seconds": raw_seconds,
+            "preprocessed_seconds": processed_seconds,
+            "raw_chars": len(raw_text),
+            "preprocessed_chars": len(processed_text),
+            "raw_quality": text_quality(raw_text),
+            "preprocessed_quality": text_quality(processed_text)
+        })
+    return rows
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python ocr_preprocess.py <screenshot_dir>", file=sys.stderr)
+        sys.exit(1)
+
+    screenshot_dir = Path(sys.argv[1])
+    image_paths = sorted(
+        p for p in screenshot_dir.iterdir()
+        if p.suffix.lower() in {'.png', '.jpg', '.jpeg'}
+    )
+    if not image_paths:
+        print(f"No images found in {screenshot_dir}")
+        sys.exit(1)
+
+    rows = compare_preprocessing(image_paths)
+
+    print(f"{'File':<24} {'Raw s':>8} {'Prep s':>8} {'Raw Q':>6} {'Prep Q':>6}")
+    for row in rows:
+        note = "  (blank, skipped)" if row['skipped_blank'] else ""
+        print(f"{row['filename']:<24} {row['raw_seconds']:>8.3f} {row['preprocessed_seconds']:>8.3f} "
+              f"{row['raw_quality']:>6.2f} {row['preprocessed_quality']:>6.2f}{note}")
+
+    raw_total = sum(r['raw_seconds'] for r in rows)
+    prep_total = sum(r['preprocessed_seconds'] for r in rows)
+    print(f"\nTotal OCR time: {raw_total:.2f}s raw, {prep_total:.2f}s preprocessed "
+          f"({(1 - prep_total / max(raw_total, 1e-9)) * 100:.1f}% saved)")
+    print(f"Mean text quality: {sum(r['raw_quality'] for r in rows) / len(rows):.2f} raw, "
+          f"{sum(r['preprocessed_quality'] for r in rows) / len(rows):.2f} preprocessed")
+
+
+if __name__ == "__main__":
+    main()
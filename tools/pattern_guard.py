@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Cost vetting and runtime time budgets for custom analyzer patterns.
+
+Custom regexes (TranscriptAnalyzer.add_pattern, transcript_analyzer.py
+--patterns) are vetted when loaded. vet_pattern times the pattern on
+adversarial inputs of growing length: runs of one character, whitespace,
+OCR-style garble, strings pumped from the pattern's own literals and
+words, and runs of each single character the pattern can match (every
+literal, and one representative per class: "1" for \d, "a" for \w,
+" " for \s, a member of each [...] set), each ending in a character that
+forces the match to fail. Single-character runs are what nested
+quantifiers such as (\d+\.?)+% or (x+x+)+y backtrack on exponentially;
+mixed literals usually break the repetition early. It then estimates how
+matching time grows with input length:
+
+- "ok": roughly linear
+- "superlinear": time grows faster than GROWTH_LIMIT (log-log slope);
+  the pattern is loaded but flagged
+- "too_slow": an input of message length (up to REJECT_SIZE characters)
+  took longer than the vetting time cap, typically catastrophic
+  backtracking; the pattern is rejected
+
+Python cannot interrupt a running regex, so the input sizes grow gradually
+(one character at a time while short, where exponential backtracking
+doubles in cost per character) and vetting stops at the first input over
+the cap; a catastrophic pattern costs at most a few times the cap to
+detect. Past REJECT_SIZE, hitting the
+cap ends vetting and the growth measured so far decides the status.
+
+At runtime PatternGuard wraps compiled patterns and times every call. Once
+a message's total matching time passes the budget, the remaining pattern
+calls for that message are skipped, and the message, the slowest pattern
+and the times are recorded as an overrun.
+"""
+
+import math
+import random
+import re
+import time
+
+# The regex parser is private; without it, inputs are pumped from the
+# pattern's words only
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    try:
+        import sre_parse
+    except ImportError:
+        sre_parse = None
+
+# Input lengths tried: one character at a time up to 29, then growing by
+# about 1.3x, so a backtracking blow-up is caught soon after it becomes
+# measurable
+VET_SIZES = list(range(8, 29)) + [29, 38, 50, 65, 85, 110, 143, 186, 242, 315, 410,
+                                  533, 693, 901, 1171, 1522, 1979, 2573, 3345, 4349, 5654, 7350, 9555]
+
+# Growth is fitted on inputs at least this long; the one-character steps
+# below it would weigh call overhead heavily in the slope
+MIN_FIT_SIZE = 29
+
+# A single vetting input may take at most this long
+VET_TIME_CAP = 0.05
+
+# Inputs up to this length must stay under the cap (a long chat message)
+REJECT_SIZE = 1000
+
+# Log-log slope of time against length above which a pattern is flagged
+GROWTH_LIMIT = 1.5
+
+# Timings below this are dominated by call overhead and ignored for the slope
+MIN_TIMED = 20e-6
+
+DEFAULT_MESSAGE_BUDGET = 0.05
+
+
+# One character matched by each class escape, by sre_parse category name
+CATEGORY_REPRESENTATIVES = {
+    "CATEGORY_DIGIT": "1",
+    "CATEGORY_NOT_DIGIT": "a",
+    "CATEGORY_WORD": "a",
+    "CATEGORY_NOT_WORD": ".",
+    "CATEGORY_SPACE": " ",
+    "CATEGORY_NOT_SPACE": "a"
+}
+
+
+def _pattern_literals(pattern):
+    """
+    Characters and words appearing in a pattern, for pumping inputs.
+
+    Returns (literal_chars, words, single_chars): the pattern's literal
+    characters, its words, and every character to pump on its own (each
+    literal plus one representative per character class or ".").
+    """
+    chars = []
+    singles = []
+
+    def walk(items, categories):
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                chars.append(chr(av))
+                singles.append(chr(av))
+            elif op is sre_parse.IN:
+                # One member of the set; a negated set is left to the other inputs
+                for member_op, member in av:
+                    if member_op is sre_parse.NEGATE:
+                        break
+                    if member_op is sre_parse.LITERAL:
+                        singles.append(chr(member))
+                    elif member_op is sre_parse.RANGE:
+                        singles.append(chr(member[0]))
+                    elif member_op is sre_parse.CATEGORY and member in categories:
+                        singles.append(categories[member])
+                    else:
+                        continue
+                    break
+            elif op is sre_parse.ANY:
+                singles.append('a')
+            elif op is sre_parse.SUBPATTERN:
+                walk(av[-1], categories)
+            elif op is sre_parse.BRANCH:
+                for branch in av[1]:
+                    walk(branch, categories)
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, 'POSSESSIVE_REPEAT', None)):
+                walk(av[2], categories)
+            elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+                walk(av[1], categories)
+            elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+                walk(av, categories)
+
+    try:
+        categories = {getattr(sre_parse, name): char for name, char in CATEGORY_REPRESENTATIVES.items()}
+        walk(sre_parse.parse(pattern), categories)
+    except (re.error, AttributeError, IndexError, TypeError, ValueError):
+        pass
+    literal_chars = ''.join(dict.fromkeys(c for c in chars if not c.isspace())) or 'a'
+    words = re.findall(r'[A-Za-z]{2,}', pattern) or ['word']
+    single_chars = ''.join(dict.fromkeys(singles))
+    return literal_chars, words, single_chars
+
+
+def adversarial_inputs(pattern, size, seed=0):
+    """Inputs of about size characters that tend to trigger backtracking, each ending in a mismatch."""
+    literal_chars, words, single_chars = _pattern_literals(pattern)
+    rng = random.Random(seed + size)
+    garble = ''.join(rng.choice('abcdeilmnorstu .,;:\'"-|/1l0O') for _ in range(size))
+    pumped_words = ' '.join(words[i % len(words)] for i in range(size // 4 + 1))
+    inputs = {
+        "repeat": 'a' * size + '!',
+        "whitespace": ' ' * size + '!',
+        "literals": (literal_chars * (size // len(literal_chars) + 1))[:size] + '\x00',
+        "words": pumped_words[:size] + '\x00',
+        "garble": garble + '\x00'
+    }
+    for char in single_chars:
+        if char not in 'a ':
+            inputs[f"pumped {char!r}"] = char * size + '\x00'
+    return inputs
+
+
+def _time_scan(regex, text):
+    """Time one full scan (finditer over the whole text)."""
+    start = time.perf_counter()
+    for _ in regex.finditer(text):
+        pass
+    return time.perf_counter() - start
+
+
+def growth_exponent(samples):
+    """Least-squares slope of log(time) over log(size), from (size, seconds) samples."""
+    points = [(math.log(size), math.log(seconds)) for size, seconds in samples if seconds >= MIN_TIMED]
+    if len(points) < 3:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def vet_pattern(pattern, flags=re.IGNORECASE, sizes=VET_SIZES, time_cap=VET_TIME_CAP,
+                reject_size=REJECT_SIZE, growth_limit=GROWTH_LIMIT):
+    """
+    Benchmark a pattern on adversarial inputs of growing size.
+
+    Returns {"pattern", "status", "exponent", "worst_input", "max_size",
+    "max_seconds"}; status is "ok", "superlinear" or "too_slow".
+    Raises re.error if the pattern does not compile.
+    """
+    regex = re.compile(pattern, flags)
+    samples = {}
+    worst_input = None
+    max_seconds = 0.0
+    max_size = 0
+
+    capped = False
+    for size in sizes:
+        for kind, text in adversarial_inputs(pattern, size).items():
+            seconds = _time_scan(regex, text)
+            if seconds > time_cap:
+                if size <= reject_size:
+                    return {"pattern": pattern, "status": "too_slow", "exponent": None,
+                            "worst_input": kind, "max_size": size, "max_seconds": seconds}
+                capped = True
+            elif size > 100:
+                # Best of two damps scheduler noise
+                seconds = min(seconds, _time_scan(regex, text))
+            if size >= MIN_FIT_SIZE:
+                samples.setdefault(kind, []).append((size, seconds))
+            if seconds > max_seconds:
+                max_seconds, worst_input = seconds, kind
+        max_size = size
+        if capped:
+            break
+
+    exponents = {kind: growth_exponent(points) for kind, points in samples.items()}
+    measured = {kind: e for kind, e in exponents.items() if e is not None}
+    exponent = max(measured.values()) if measured else None
+    if measured:
+        worst_input = max(measured, key=measured.get)
+    status = "superlinear" if exponent is not None and exponent > growth_limit else "ok"
+    return {"pattern": pattern, "status": status, "exponent": exponent,
+            "worst_input": worst_input, "max_size": max_size, "max_seconds": max_seconds}
+
+
+class GuardedPattern:
+    """A compiled pattern whose calls are timed against the guard's message budget."""
+
+    def __init__(self, guard, regex):
+        self.guard = guard
+        self.regex = regex
+        self.pattern = regex.pattern
+
+    def search(self, text):
+        if self.guard.exhausted:
+            return None
+        start = time.perf_counter()
+        try:
+            return self.regex.search(text)
+        finally:
+            self.guard.record(self.pattern, time.perf_counter() - start)
+
+    def findall(self, text):
+        if self.guard.exhausted:
+            return []
+        start = time.perf_counter()
+        try:
+            return self.regex.findall(text)
+        finally:
+            self.guard.record(self.pattern, time.perf_counter() - start)
+
+
+class PatternGuard:
+    """Per-message matching time budget with overrun records."""
+
+    def __init__(self, message_budget=DEFAULT_MESSAGE_BUDGET):
+        self.message_budget = message_budget
+        self.overruns = []
+        self.message_index = None
+        self.elapsed = 0.0
+        self.exhausted = False
+        self._pattern_seconds = {}
+
+    def wrap(self, regex):
+        """Wrap a compiled pattern (re-wrapping an already guarded one is a no-op)."""
+        if isinstance(regex, GuardedPattern):
+            return regex
+        return GuardedPattern(self, regex)
+
+    def begin_message(self, message_index=None):
+        """Start timing a new message."""
+        self.message_index = message_index
+        self.elapsed = 0.0
+        self.exhausted = False
+        self._pattern_seconds = {}
+
+    def record(self, pattern, seconds):
+        """Account one pattern call; on passing the budget, record an overrun and stop matching."""
+        self.elapsed += seconds
+        self._pattern_seconds[pattern] = self._pattern_seconds.get(pattern, 0.0) + seconds
+        if self.elapsed > self.message_budget and not self.exhausted:
+            self.exhausted = True
+            slowest = max(self._pattern_seconds, key=self._pattern_seconds.get)
+            self.overruns.append({
+                "message_index": self.message_index,
+                "pattern": slowest,
+                "pattern_seconds": self._pattern_seconds[slowest],
+                "message_seconds": self.elapsed,
+                "budget_seconds": self.message_budget
+            })
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Performance budgets for the transcript analyzer.
+
+Measures TranscriptAnalyzer throughput (messages analyzed per second) and
+peak memory (tracemalloc) on the example transcripts and on a generated
+large transcript, and compares them with the budgets recorded in
+performance_budgets.json. validate_portfolio.py runs this as a validation
+stage.
+
+Budgets are recorded per Python version (major.minor): tracemalloc peaks
+differ between interpreter versions. Peak memory is deterministic for a
+given transcript and version, so exceeding its tolerance fails validation.
+Throughput depends on the machine and its load (shared CI runners vary by
+more than the tolerance from run to run), so a shortfall beyond
+throughput_tolerance is a warning; only throughput more than
+throughput_failure_ratio times slower than the budget fails. Each timed round
+analyzes at least min_messages messages, repeating a workload's
+transcripts if needed, so a small workload such as examples/ is not
+timed in the noise of a few milliseconds.
+
+measure_speedup times serial against parallel analysis of one generated
+conversation (analyze_conversation(workers=N)); it is informational and
+not part of validation.
+
+Usage:
+    python performance_check.py [portfolio_dir]            # measure and compare
+    python performance_check.py [portfolio_dir] --record   # re-record the budgets
+    python performance_check.py --speedup 4 [--speedup-messages 40000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from transcript_analyzer import TranscriptAnalyzer
+
+BUDGETS_FILENAME = "performance_budgets.json"
+
+MARKS = {"ok": "✓", "warning": "⚠", "error": "✗"}
+
+DEFAULT_CONFIG = {
+    # Allowed relative slowdown / memory growth before validation fails
+    "throughput_tolerance": 0.5,
+    "memory_tolerance": 0.25,
+    # Throughput this many times below the budget fails validation
+    "throughput_failure_ratio": 3.0,
+    # Timed rounds per workload; the fastest round counts
+    "rounds": 5,
+    # Messages analyzed per timed round at least (transcripts are repeated)
+    "min_messages": 1000,
+    "large_transcript": {"messages": 1000, "seed": 0},
+    # {python version: {workload: budget}}
+    "budgets": {}
+}
+
+# Sentences mixing the analyzer's disclaimer, jargon, collaborative and formal patterns
+USER_SENTENCES = [
+    "What are the general guidelines for this?",
+    "I work on the evaluation team and need the technical details.",
+    "Could you elaborate on the methodology?",
+    "How would you approach the risk assessment?"
+]
+ASSISTANT_SENTENCES = [
+    "Please note that this is not medical advice.",
+    "You should consult a doctor before making any changes.",
+    "Warning: dosages vary between individuals.",
+    "The evaluation framework relies on a systematic methodology.",
+    "From a regulatory and compliance standpoint the protocol is standard.",
+    "We can review the implementation and deployment architecture together.",
+    "Let's consider the quantitative and statistical evidence.",
+    "Furthermore, the empirical validation supports this approach.",
+    "However, the heuristic has known limitations.",
+    "In conclusion, the assessment depends on the stakeholder requirements.",
+    "The model tokenizes the input and computes an embedding vector.",
+    "This is a reasonable summary of the main points."
+]
+
+
+def generate_transcript(messages, seed=0):
+    """Build a deterministic user/assistant conversation with the given number of messages."""
+    rng = random.Random(seed)
+    conversation = []
+    for i in range(messages):
+        if i % 2 == 0:
+            content = " ".join(rng.choice(USER_SENTENCES) for _ in range(2))
+            conversation.append({"role": "user", "content": content})
+        else:
+            content = " ".join(rng.choice(ASSISTANT_SENTENCES) for _ in range(8))
+            conversation.append({"role": "assistant", "content": content})
+    return conversation
+
+
+def python_version():
+    """The major.minor version budgets are recorded under, e.g. "3.11"."""
+    return "{}.{}".format(*sys.version_info[:2])
+
+
+def load_config(budgets_path):
+    """Load the budgets file, filling in defaults for missing settings."""
+    config = dict(DEFAULT_CONFIG)
+    if Path(budgets_path).exists():
+        with open(budgets_path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    return config
+
+
+def measure(transcript_paths, rounds=3, min_messages=0):
+    """
+    Load and analyze transcript files, returning throughput and peak memory.
+
+    Each timed round goes over the files repeatedly until at least
+    min_messages messages were analyzed. Timing and memory are measured in
+    separate passes because tracemalloc slows allocation-heavy code
+    considerably; the memory pass goes over the files once.
+    """
+    def run(min_messages=0):
+        analyzer = TranscriptAnalyzer()
+        messages = 0
+        while True:
+            for path in transcript_paths:
+                conversation = analyzer.load_transcript(str(path))
+                analyzer.analyze_conversation(conversation)
+                messages += len(conversation)
+            if messages >= min_messages or messages == 0:
+                return messages
+
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        messages = run(min_messages)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "messages": messages,
+        "seconds": best,
+        "messages_per_second": messages / best if best > 0 else 0.0,
+        "peak_memory_bytes": peak
+    }
+
+
+def run_workloads(portfolio_path, config):
+    """Measure every workload: {"examples": ..., "large_transcript": ...}."""
+    portfolio_path = Path(portfolio_path)
+    rounds = config["rounds"]
+    min_messages = config["min_messages"]
+    results = {}
+
+    examples = sorted((portfolio_path / "examples").glob("*.json"))
+    if examples:
+        results["examples"] = measure(examples, rounds, min_messages)
+
+    large = config["large_transcript"]
+    conversation = generate_transcript(large["messages"], large.get("seed", 0))
+    fd, tmp_name = tempfile.mkstemp(suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"conversation": conversation}, f)
+        results["large_transcript"] = measure([tmp_name], rounds, min_messages)
+    finally:
+        os.remove(tmp_name)
+
+    return results
+
+
+def compare(results, config, version=None):
+    """
+    Compare measurements with the budgets recorded for a Python version.
+
+    Returns a list of (status, message) pairs, one per budgeted metric;
+    status is "ok", "warning" (throughput below its floor, or no budgets
+    for this Python version) or "error" (throughput below its failure
+    limit, memory above its ceiling, or a missing measurement).
+    """
+    version = version or python_version()
+    budgets = config["budgets"].get(version)
+    if budgets is None:
+        recorded = ", ".join(sorted(config["budgets"])) or "none"
+        return [("warning", f"no budgets recorded for Python {version} (recorded: {recorded}); "
+                            f"run performance_check.py --record")]
+
+    outcomes = []
+    for workload, budget in budgets.items():
+        measured = results.get(workload)
+        if measured is None:
+            outcomes.append(("error", f"{workload}: no measurement for budgeted workload"))
+            continue
+
+        floor = budget["messages_per_second"] * (1 - config["throughput_tolerance"])
+        limit = budget["messages_per_second"] / config["throughput_failure_ratio"]
+        rate = measured["messages_per_second"]
+        outcomes.append((
+            "ok" if rate >= floor else "warning" if rate >= limit else "error",
+            f"{workload}: {rate:,.0f} messages/s (budget {budget['messages_per_second']:,.0f}, "
+            f"minimum {floor:,.0f}, failing below {limit:,.0f})"
+        ))
+
+        ceiling = budget["peak_memory_bytes"] * (1 + config["memory_tolerance"])
+        peak = measured["peak_memory_bytes"]
+        outcomes.append((
+            "ok" if peak <= ceiling else "error",
+            f"{workload}: peak memory {peak / 1024:,.0f} KiB (budget {budget['peak_memory_bytes'] / 1024:,.0f} KiB, "
+            f"maximum {ceiling / 1024:,.0f} KiB)"
+        ))
+    return outcomes
+
+
+def measure_speedup(messages, workers, seed=0):
+    """Time serial and parallel analysis of one generated conversation and check they agree."""
+    conversation = generate_transcript(messages, seed)
+    analyzer = TranscriptAnalyzer()
+
+    start = time.perf_counter()
+    serial = analyzer.analyze_conversation(conversation)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = analyzer.analyze_conversation(conversation, workers=workers)
+    parallel_seconds = time.perf_counter() - start
+
+    return {
+        "messages": messages,
+        "workers": workers,
+        "cpus": os.cpu_count(),
+        "serial_seconds": serial_seconds,
+        "parallel_seconds": parallel_seconds,
+        "speedup": serial_seconds / parallel_seconds if parallel_seconds > 0 else 0.0,
+        "identical": json.dumps(serial, sort_keys=True) == json.dumps(parallel, sort_keys=True)
+    }
+
+
+def record_budgets(budgets_path, results, config, version=None):
+    """
+    Write the measured values as the budgets for a Python version.
+
+    Budgets for other Python versions and the other settings are kept.
+    """
+    config = dict(config)
+    config["budgets"] = dict(config["budgets"])
+    config["budgets"][version or python_version()] = {
+        workload: {
+            "messages_per_second": round(measured["messages_per_second"]),
+            "peak_memory_bytes": measured["peak_memory_bytes"]
+        }
+        for workload, measured in results.items()
+    }
+    config["budgets"] = dict(sorted(config["budgets"].items()))
+    with open(budgets_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check transcript analyzer performance against recorded budgets')
+    parser.add_argument('portfolio_dir', nargs='?', default=str(Path(__file__).resolve().parent.parent),
+                        help='Portfolio root (default: the repository containing this script)')
+    parser.add_argument('--record', action='store_true',
+                        help=f'Record the measurements as the new budgets in tools/{BUDGETS_FILENAME}')
+    parser.add_argument('--speedup', type=int, metavar='WORKERS',
+                        help='Instead, time serial against parallel analysis with this many workers')
+    parser.add_argument('--speedup-messages', type=int, default=40000,
+                        help='Messages in the conversation timed by --speedup (default: 40000)')
+    args = parser.parse_args()
+
+    if args.speedup:
+        result = measure_speedup(args.speedup_messages, args.speedup)
+        print(f"{result['messages']} messages, {result['workers']} workers on {result['cpus']} CPUs: "
+              f"serial {result['serial_seconds']:.2f} s, parallel {result['parallel_seconds']:.2f} s, "
+              f"speedup {result['speedup']:.2f}x, results {'identical' if result['identical'] else 'DIFFER'}")
+        sys.exit(0 if result['identical'] else 1)
+
+    budgets_path = Path(args.portfolio_dir) / "tools" / BUDGETS_FILENAME
+    config = load_config(budgets_path)
+    results = run_workloads(args.portfolio_dir, config)
+
+    for workload, measured in results.items():
+        print(f"{workload}: {measured['messages']} messages in {measured['seconds'] * 1000:.1f} ms, "
+              f"{measured['messages_per_second']:,.0f} messages/s, "
+              f"peak memory {measured['peak_memory_bytes'] / 1024:,.0f} KiB")
+
+    if args.record:
+        record_budgets(budgets_path, results, config)
+        print(f"Budgets for Python {python_version()} recorded in {budgets_path}")
+        return
+
+    failed = False
+    for status, message in compare(results, config):
+        print(f"  {MARKS[status]} {message}")
+        failed = failed or status == "error"
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing for the screenshot evidence pipeline.
+
+process_screenshots wraps each stage (OCR, scoring, report writing) in
+stats.stage(name); the accumulated wall time and call count per stage
+are used by the benchmark harness. Phase boundaries are marked with
+stats.checkpoint(name), which memory_profile.MemoryProfiler uses for
+snapshots.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class StageStats:
+    """Accumulate wall time and call counts per named pipeline stage."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def checkpoint(self, name, units=None):
+        """Mark a phase boundary; units is the number of messages or images so far."""
+
+    def as_dict(self):
+        return {
+            name: {"seconds": self.seconds[name], "calls": self.calls[name]}
+            for name in self.seconds
+        }
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Local SQLite store for analysis results across runs.
+
+Transcript analyses (TranscriptAnalyzer.analyze_conversation) and
+screenshot scorer results are ingested into one database:
+
+- runs: one row per ingest, with tool, model, condition and a label
+- conversations: one row per transcript or screenshot, with summary and
+  shift metrics (transcripts) or score (screenshots)
+- messages: per-message metrics of each transcript's assistant messages
+- patterns: detected pattern flags and scorer pattern labels, with counts
+
+The database runs in WAL mode, so queries are not blocked by an ingest in
+progress. Rows are buffered and written with executemany in batched
+transactions; patterns, models, dates and shift metrics are indexed.
+
+Usage:
+    python results_store.py ingest <file>... [--db results.db] [--model M] [--condition C] [--label L]
+    python results_store.py query [--pattern P] [--model M] [--since 2026-09-01|30d] [--condition C]
+                                  [--kind transcript|screenshot] [--max-disclaimer-shift X]
+                                  [--min-jargon-shift X] [--limit N] [--count] [--output text|json]
+
+ingest accepts transcripts (JSON or text), saved analyzer JSON output
+(transcript_analyzer.py --output json) and screenshot reports (NDJSON,
+summary or legacy analysis_report.json).
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from evidence_report import iter_results
+from transcript_analyzer import TranscriptAnalyzer
+
+DEFAULT_DB = "analysis_results.db"
+
+# Buffered rows are written once either limit is reached
+BATCH_CONVERSATIONS = 1000
+BATCH_MESSAGES = 50000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    model TEXT,
+    condition TEXT,
+    label TEXT
+);
+
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    model TEXT,
+    condition TEXT,
+    recorded_at TEXT NOT NULL,
+    total_messages INTEGER,
+    user_messages INTEGER,
+    assistant_messages INTEGER,
+    total_words INTEGER,
+    total_disclaimers INTEGER,
+    total_jargon_terms INTEGER,
+    avg_disclaimer_rate REAL,
+    avg_jargon_rate REAL,
+    early_disclaimer_rate REAL,
+    late_disclaimer_rate REAL,
+    disclaimer_shift REAL,
+    early_jargon_rate REAL,
+    late_jargon_rate REAL,
+    jargon_shift REAL,
+    score REAL
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id INTEGER NOT NULL REFERENCES conversations(id),
+    message_index INTEGER NOT NULL,
+    word_count INTEGER,
+    sentence_count INTEGER,
+    disclaimer_count INTEGER,
+    jargon_count INTEGER,
+    collaborative_count INTEGER,
+    formal_count INTEGER,
+    disclaimer_rate REAL,
+    jargon_rate REAL,
+    collaborative_rate REAL,
+    formal_rate REAL,
+    PRIMARY KEY (conversation_id, message_index)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS patterns (
+    pattern TEXT NOT NULL,
+    conversation_id INTEGER NOT NULL REFERENCES conversations(id),
+    count INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (pattern, conversation_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_patterns_conversation ON patterns (conversation_id);
+CREATE INDEX IF NOT EXISTS idx_conversations_model_date ON conversations (model, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_conversations_date ON conversations (recorded_at);
+CREATE INDEX IF NOT EXISTS idx_conversations_disclaimer_shift ON conversations (disclaimer_shift);
+CREATE INDEX IF NOT EXISTS idx_conversations_jargon_shift ON conversations (jargon_shift);
+CREATE INDEX IF NOT EXISTS idx_conversations_run ON conversations (run_id);
+"""
+
+SUMMARY_COLUMNS = [
+    "total_messages", "user_messages", "assistant_messages", "total_words",
+    "total_disclaimers", "total_jargon_terms", "avg_disclaimer_rate", "avg_jargon_rate"
+]
+TEMPORAL_COLUMNS = [
+    "early_disclaimer_rate", "late_disclaimer_rate", "disclaimer_shift",
+    "early_jargon_rate", "late_jargon_rate", "jargon_shift"
+]
+CONVERSATION_COLUMNS = (
+    ["id", "run_id", "kind", "source", "model", "condition", "recorded_at"]
+    + SUMMARY_COLUMNS + TEMPORAL_COLUMNS + ["score"]
+)
+MESSAGE_COLUMNS = [
+    "conversation_id", "message_index", "word_count", "sentence_count",
+    "disclaimer_count", "jargon_count", "collaborative_count", "formal_count",
+    "disclaimer_rate", "jargon_rate", "collaborative_rate", "formal_rate"
+]
+
+# Columns shown by the query command
+QUERY_COLUMNS = ["id", "kind", "source", "model", "condition", "recorded_at",
+                 "disclaimer_shift", "jargon_shift", "score"]
+
+
+def utc_now():
+    """Current time as an ISO-8601 UTC string (second precision)."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def parse_since(value):
+    """Turn "2026-09-01" or a relative "30d" / "12h" into an ISO-8601 UTC lower bound."""
+    match = re.fullmatch(r'(\d+)([dh])', value)
+    if match:
+        amount = int(match.group(1))
+        delta = timedelta(days=amount) if match.group(2) == 'd' else timedelta(hours=amount)
+        return (datetime.now(timezone.utc) - delta).strftime('%Y-%m-%dT%H:%M:%S')
+    # Validate; ISO strings compare correctly as text
+    datetime.fromisoformat(value)
+    return value
+
+
+def pattern_label_count(label):
+    """Split a scorer label "self_reflection (count: 5)" into ("self_reflection", 5)."""
+    match = re.fullmatch(r'(.*) \(count: (\d+)\)', label)
+    if match:
+        return match.group(1), int(match.group(2))
+    return label, 1
+
+
+class ResultsStore:
+    """Batched writer and indexed query interface for the results database."""
+
+    def __init__(self, db_path=DEFAULT_DB):
+        self.db_path = Path(db_path)
+        # Transactions are managed explicitly (BEGIN IMMEDIATE in flush)
+        self.conn = sqlite3.connect(str(self.db_path), isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._conversations = []
+        self._messages_pending = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def start_run(self, tool, model=None, condition=None, label=None):
+        """Record a run and return its id."""
+        cursor = self.conn.execute(
+            "INSERT INTO runs (created_at, tool, model, condition, label) VALUES (?, ?, ?, ?, ?)",
+            (utc_now(), tool, model, condition, label)
+        )
+        return cursor.lastrowid
+
+    def add_conversation(self, run_id, source, analysis, model=None, condition=None, recorded_at=None):
+        """Buffer an analyze_conversation result with its per-message metrics and patterns."""
+        summary = analysis.get('conversation_summary', {})
+        temporal = analysis.get('temporal_analysis', {})
+        row = {
+            "run_id": run_id, "kind": "transcript", "source": str(source),
+            "model": model, "condition": condition, "recorded_at": recorded_at or utc_now(),
+            "score": None
+        }
+        row.update({column: summary.get(column) for column in SUMMARY_COLUMNS})
+        row.update({column: temporal.get(column) for column in TEMPORAL_COLUMNS})
+
+        messages = [
+            tuple(message.get(column) for column in MESSAGE_COLUMNS[1:])
+            for message in analysis.get('message_analyses', [])
+        ]
+        patterns = [(name, 1) for name, value in analysis.get('detected_patterns', {}).items() if value]
+        self._buffer(row, messages, patterns)
+
+    def add_screenshot(self, run_id, result, model=None, condition=None, recorded_at=None):
+        """Buffer one screenshot scorer result."""
+        analysis = result['analysis']
+        row = {column: None for column in SUMMARY_COLUMNS + TEMPORAL_COLUMNS}
+        row.update({
+            "run_id": run_id, "kind": "screenshot", "source": result.get('path', result['filename']),
+            "model": model, "condition": condition, "recorded_at": recorded_at or utc_now(),
+            "score": analysis['score']
+        })
+        patterns = [pattern_label_count(label) for label in analysis.get('patterns', [])]
+        if analysis.get('is_case02_candidate'):
+            patterns.append(('case02_candidate', 1))
+        self._buffer(row, [], patterns)
+
+    def _buffer(self, row, messages, patterns):
+        self._conversations.append((row, messages, patterns))
+        self._messages_pending += len(messages)
+        if len(self._conversations) >= BATCH_CONVERSATIONS or self._messages_pending >= BATCH_MESSAGES:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows in one transaction."""
+        if not self._conversations:
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Ids are assigned here so child rows can be written with executemany;
+            # BEGIN IMMEDIATE keeps other writers out until commit
+            next_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM conversations").fetchone()[0]
+            conversation_rows = []
+            message_rows = []
+            pattern_rows = []
+            for offset, (row, messages, patterns) in enumerate(self._conversations):
+                conversation_id = next_id + offset
+                row["id"] = conversation_id
+                conversation_rows.append(tuple(row[column] for column in CONVERSATION_COLUMNS))
+                message_rows.extend((conversation_id,) + message for message in messages)
+                pattern_rows.extend((name, conversation_id, count) for name, count in patterns)
+
+            placeholders = ", ".join("?" for _ in CONVERSATION_COLUMNS)
+            self.conn.executemany(
+                f"INSERT INTO conversations ({', '.join(CONVERSATION_COLUMNS)}) VALUES ({placeholders})",
+                conversation_rows
+            )
+            placeholders = ", ".join("?" for _ in MESSAGE_COLUMNS)
+            self.conn.executemany(
+                f"INSERT INTO messages ({', '.join(MESSAGE_COLUMNS)}) VALUES ({placeholders})",
+                message_rows
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO patterns (pattern, conversation_id, count) VALUES (?, ?, ?)",
+                pattern_rows
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self._conversations = []
+        self._messages_pending = 0
+
+    def _filtered(self, select, pattern=None, model=None, condition=None, since=None, kind=None,
+                  max_disclaimer_shift=None, min_jargon_shift=None):
+        """Build "SELECT ... FROM conversations c [JOIN patterns] WHERE ..." and its parameters."""
+        clauses = []
+        params = []
+        join = ""
+        if pattern:
+            join = "JOIN patterns p ON p.conversation_id = c.id AND p.pattern = ?"
+            params.append(pattern)
+        for column, value in (("c.model", model), ("c.condition", condition), ("c.kind", kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("c.recorded_at >= ?")
+            params.append(parse_since(since))
+        if max_disclaimer_shift is not None:
+            clauses.append("c.disclaimer_shift <= ?")
+            params.append(max_disclaimer_shift)
+        if min_jargon_shift is not None:
+            clauses.append("c.jargon_shift >= ?")
+            params.append(min_jargon_shift)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return f"SELECT {select} FROM conversations c {join} {where}", params
+
+    def query(self, limit=100, **filters):
+        """Return conversations matching the filters (see _filtered) as dicts, newest first."""
+        sql, params = self._filtered(", ".join('c.' + column for column in QUERY_COLUMNS), **filters)
+        sql += " ORDER BY c.recorded_at DESC, c.id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(zip(QUERY_COLUMNS, row)) for row in self.conn.execute(sql, params)]
+
+    def count(self, **filters):
+        """Number of conversations matching the filters."""
+        sql, params = self._filtered("COUNT(*)", **filters)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+
+def ingest_file(store, run_id, path, analyzer, model=None, condition=None):
+    """Ingest one transcript, analyzer output or screenshot report; returns rows buffered."""
+    path = Path(path)
+    if path.suffix.lower() == '.ndjson':
+        results = iter_results(path)
+        data = None
+    elif path.suffix.lower() == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        results = None
+        if isinstance(data, dict) and data.get('results_file'):
+            results = iter_results(path.parent / data['results_file'])
+        elif isinstance(data, dict) and 'all_results' in data:
+            results = data['all_results']
+    else:
+        data = None
+        results = None
+
+    if results is not None:
+        count = 0
+        for result in results:
+            store.add_screenshot(run_id, result, model=model, condition=condition)
+            count += 1
+        return count
+
+    metadata = data.get('metadata', {}) if isinstance(data, dict) else {}
+    model = model or metadata.get('model')
+    condition = condition or metadata.get('condition')
+    recorded_at = metadata.get('date')
+    if isinstance(data, dict) and 'conversation_summary' in data:
+        # Saved analyzer output
+        analysis = data
+    else:
+        analysis = analyzer.analyze_conversation(analyzer.load_transcript(str(path)))
+    store.add_conversation(run_id, path, analysis, model=model, condition=condition, recorded_at=recorded_at)
+    return 1
+
+
+def format_rows(rows):
+    """Format query rows as a text table."""
+    if not rows:
+        return "No matching results."
+    lines = [f"{'ID':>8}  {'Kind':<10}  {'Model':<20}  {'Condition':<12}  {'Recorded':<19}  "
+             f"{'Discl. shift':>12}  {'Jargon shift':>12}  {'Score':>6}  Source"]
+    for row in rows:
+        def number(value):
+            return f"{value:.3f}" if value is not None else "-"
+        lines.append(
+            f"{row['id']:>8}  {row['kind']:<10}  {str(row['model'] or '-')[:20]:<20}  "
+            f"{str(row['condition'] or '-')[:12]:<12}  {row['recorded_at'][:19]:<19}  "
+            f"{number(row['disclaimer_shift']):>12}  {number(row['jargon_shift']):>12}  "
+            f"{row['score'] if row['score'] is not None else '-':>6}  {row['source']}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Store and query analysis results across runs')
+    parser.add_argument('--db', default=DEFAULT_DB, help=f'SQLite database (default: {DEFAULT_DB})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subparsers.add_parser('ingest', help='Analyze and store transcripts, analyses or screenshot reports')
+    ingest.add_argument('files', nargs='+', help='Transcript, analyzer JSON output or screenshot report files')
+    ingest.add_argument('--model', help='Model name (default: transcript metadata)')
+    ingest.add_argument('--condition', help='Framing condition (default: transcript metadata)')
+    ingest.add_argument('--label', help='Free-form label for this run')
+
+    query = subparsers.add_parser('query', help='Find stored conversations')
+    query.add_argument('--pattern', help='Detected pattern, e.g. significant_disclaimer_reduction')
+    query.add_argument('--model', help='Model name')
+    query.add_argument('--condition', help='Framing condition')
+    query.add_argument('--since', help='Earliest date (YYYY-MM-DD) or age (30d, 12h)')
+    query.add_argument('--kind', choices=['transcript', 'screenshot'], help='Result type')
+    query.add_argument('--max-disclaimer-shift', type=float, help='Only disclaimer shifts at or below this')
+    query.add_argument('--min-jargon-shift', type=float, help='Only jargon shifts at or above this')
+    query.add_argument('--limit', type=int, default=50, help='Maximum rows (default: 50)')
+    query.add_argument('--count', action='store_true', help='Only print the number of matches')
+    query.add_argument('--output', '-o', choices=['text', 'json'], default='text', help='Output format')
+
+    args = parser.parse_args()
+    store = ResultsStore(args.db)
+    start = time.perf_counter()
+
+    try:
+        if args.command == 'ingest':
+            analyzer = TranscriptAnalyzer()
+            run_id = store.start_run('results_store', model=args.model, condition=args.condition, label=args.label)
+            total = 0
+            for path in args.files:
+                try:
+                    total += ingest_file(store, run_id, path, analyzer, model=args.model, condition=args.condition)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Skipping {path}: {e}", file=sys.stderr)
+            store.flush()
+            print(f"Ingested {total} results from {len(args.files)} files as run {run_id} "
+                  f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+            return
+
+        filters = dict(pattern=args.pattern, model=args.model, condition=args.condition, since=args.since,
+                       kind=args.kind, max_disclaimer_shift=args.max_disclaimer_shift,
+                       min_jargon_shift=args.min_jargon_shift)
+        if args.count:
+            print(store.count(**filters))
+        else:
+            rows = store.query(limit=args.limit, **filters)
+            print(json.dumps(rows, indent=2) if args.output == 'json' else format_rows(rows))
+        print(f"({(time.perf_counter() - start) * 1000:.1f} ms)", file=sys.stderr)
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
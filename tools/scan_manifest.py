@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Processed-files manifest for incremental screenshot scanning.
+
+The manifest records the size, mtime and SHA-256 of every screenshot that
+has been processed. On the next run only new or changed images are sent
+through OCR; results for unchanged images are carried over from the
+previous analysis report.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ScanManifest:
+    """Track which screenshots have already been processed, keyed by path."""
+
+    def __init__(self, manifest_path, settings=None):
+        self.manifest_path = Path(manifest_path)
+        # Results depend on these (e.g. preprocessing on/off, the OCR backend); a change
+        # invalidates every recorded entry
+        self.settings = settings or {}
+        self.entries = {}
+        self._pending = {}
+
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('settings') == self.settings:
+                    self.entries = data.get('files', {})
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Ignoring unreadable manifest {self.manifest_path}: {e}")
+
+    def partition(self, image_files):
+        """
+        Split image files into (pending, unchanged) lists.
+
+        Size and mtime are compared first; the content hash is only computed
+        when they differ, so a touched-but-identical file is still unchanged.
+        Entries for files that no longer exist are dropped, and a duplicate
+        whose representative is pending or gone is reprocessed along with it.
+        """
+        pending = []
+        unchanged = []
+        for path in image_files:
+            key = str(path)
+            stat = path.stat()
+            entry = self.entries.get(key)
+
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+                unchanged.append(path)
+                continue
+
+            digest = file_digest(path)
+            if entry and entry['sha256'] == digest:
+                entry['size'] = stat.st_size
+                entry['mtime'] = stat.st_mtime
+                unchanged.append(path)
+                continue
+
+            self._pending[key] = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'sha256': digest
+            }
+            pending.append(path)
+
+        current = {str(path) for path in image_files}
+        for key in list(self.entries):
+            if key not in current:
+                del self.entries[key]
+
+        # Duplicates were never OCR'd themselves; their results live on the
+        # representative's entry, so they must follow it
+        still_unchanged = []
+        for path in unchanged:
+            entry = self.entries[str(path)]
+            representative = entry.get('duplicate_of')
+            if representative and (representative in self._pending or representative not in self.entries):
+                self._pending[str(path)] = {k: v for k, v in entry.items() if k != 'duplicate_of'}
+                del self.entries[str(path)]
+                pending.append(path)
+            else:
+                still_unchanged.append(path)
+        pending.sort()
+
+        return pending, still_unchanged
+
+    def mark_processed(self, path, duplicate_of=None):
+        """Record a pending image as processed (or as a duplicate of another image)."""
+        key = str(path)
+        if key in self._pending:
+            self.entries[key] = self._pending.pop(key)
+            if duplicate_of is not None:
+                self.entries[key]['duplicate_of'] = str(duplicate_of)
+
+    def reset(self):
+        """Forget all entries so every image is treated as new."""
+        self.entries = {}
+
+    def save(self):
+        """Write the manifest atomically."""
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'settings': self.settings, 'files': self.entries}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
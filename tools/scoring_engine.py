@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Shared pattern scoring engine for the screenshot evidence scorers.
+
+A scorer is declared as data (see evidence_patterns.py): an ordered list of
+categories, each with a count key, an optional report label, a weight and
+its regex patterns, plus penalties applied when a category's count passes
+a threshold. Every pattern is compiled once when the scorer is built.
+
+Counts are identical to summing len(re.findall(pattern, text)) per pattern.
+Most patterns do not occur in a given screenshot, so each pattern is
+screened first: literal text that every match must contain ("evaluat",
+"anthropic", one of "disclaimer"/"caution"/...) is extracted from the
+parsed regex, the OCR text is case-folded once, and a pattern whose
+required literals are all absent is never run. Only the remaining
+patterns scan the text.
+
+The literals come from CPython's regex parser, which is private
+(re._parser, sre_parse before 3.11). It is only used on the versions in
+PARSER_VERSIONS, whose parse trees have the layout _analyze expects; on
+other versions, or if parsing a pattern fails, the pattern gets no
+literals and is always scanned. That is slower but counts stay exact.
+
+(A single combined regex with one lookahead group per pattern also gives
+exact counts, but CPython's backtracking engine tries every branch at
+every position and it measured slower than separate scans.)
+"""
+
+import re
+import sys
+
+# Python versions whose private regex parser layout _analyze was checked against
+PARSER_VERSIONS = ((3, 8), (3, 13))
+
+sre_parse = None
+if PARSER_VERSIONS[0] <= sys.version_info[:2] <= PARSER_VERSIONS[1]:
+    try:
+        from re import _parser as sre_parse
+    except ImportError:  # Python < 3.11
+        import sre_parse
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter
+_FOLD_FIXES = str.maketrans({'İ': 'i', 'ı': 'i', 'ſ': 's', 'K': 'k'})
+
+# Required literals shorter than this occur in almost any text
+MIN_LITERAL_LENGTH = 3
+
+# Stop extending a literal run once its alternatives multiply beyond this
+MAX_LITERALS = 32
+
+
+def fold(text):
+    """Case-fold text so a case-insensitive literal match implies substring containment."""
+    return text.translate(_FOLD_FIXES).lower()
+
+
+def _best(candidates):
+    """Pick the candidate set whose shortest literal is longest."""
+    usable = [c for c in candidates if c and '' not in c]
+    if not usable:
+        return None
+    return max(usable, key=lambda c: (min(len(s) for s in c), -len(c)))
+
+
+def _analyze(items):
+    """
+    Analyze a parsed regex sequence for required literals.
+
+    Returns (candidates, exact): candidates is a list of literal sets, each
+    of which has a member contained in every match; exact is the set of
+    strings the sequence matches if it is purely literal, else None.
+    """
+    candidates = []
+    run = {''}
+    exact = True
+    for op, av in items:
+        sub_candidates = []
+        if op is sre_parse.LITERAL:
+            strings = {chr(av)}
+        elif op is sre_parse.AT:
+            # Zero-width (\b, ^, $): constrains position, not text
+            strings = {''}
+        elif op is sre_parse.SUBPATTERN:
+            sub_candidates, strings = _analyze(av[-1])
+        elif op is sre_parse.BRANCH:
+            results = [_analyze(branch) for branch in av[1]]
+            strings = None
+            if all(branch_exact is not None for _, branch_exact in results):
+                strings = set().union(*(branch_exact for _, branch_exact in results))
+            # Every match goes through some branch, so the union of each
+            # branch's best requirement is itself a requirement
+            bests = [_best(branch_candidates + [branch_exact])
+                     for branch_candidates, branch_exact in results]
+            if all(bests):
+                sub_candidates = [set().union(*bests)]
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            # Repeated at least once: the body's requirements still hold
+            sub_candidates, _ = _analyze(av[2])
+            strings = None
+        else:
+            strings = None
+
+        candidates.extend(sub_candidates)
+        if strings is not None and run is not None and len(run) * len(strings) <= MAX_LITERALS:
+            run = {p + q for p in run for q in strings}
+            continue
+
+        # The literal run is broken; keep it as a candidate and maybe start anew
+        exact = False
+        if run:
+            candidates.append(run)
+        run = set(strings) if strings is not None and len(strings) <= MAX_LITERALS else None
+
+    if run:
+        candidates.append(run)
+    return candidates, (run if exact else None)
+
+
+def required_literals(pattern):
+    """
+    Case-folded literals one of which must occur in any text the pattern matches.
+
+    Returns None if no useful requirement can be derived, including when
+    the regex parser is unavailable (see PARSER_VERSIONS).
+    """
+    if sre_parse is None:
+        return None
+    try:
+        candidates, _ = _analyze(sre_parse.parse(pattern))
+    except (re.error, AttributeError, IndexError, TypeError, ValueError):
+        # Unexpected parse tree: run the pattern unconditionally
+        return None
+    best = _best(candidates)
+    if not best or min(len(s) for s in best) < MIN_LITERAL_LENGTH:
+        return None
+    return tuple(sorted({fold(s) for s in best}))
+
+
+class PatternScorer:
+    """Count pattern categories and compute a weighted score from a declarative spec."""
+
+    def __init__(self, spec):
+        self.categories = spec['categories']
+        self.penalties = spec.get('penalties', [])
+
+        # (category index, compiled pattern, required literals) per pattern
+        self._patterns = []
+        for index, category in enumerate(self.categories):
+            for pattern in category['patterns']:
+                self._patterns.append((index, re.compile(pattern), required_literals(pattern)))
+
+    def count(self, text):
+        """Return {count key: matches}, summed per-pattern findall counts."""
+        folded = fold(text)
+        totals = [0] * len(self.categories)
+        for index, regex, literals in self._patterns:
+            if literals and not any(literal in folded for literal in literals):
+                continue
+            for _ in regex.finditer(text):
+                totals[index] += 1
+        return {category['key']: total for category, total in zip(self.categories, totals)}
+
+    def score(self, text):
+        """Score text, returning {"score", "patterns", "counts"}."""
+        counts = self.count(text)
+
+        score = sum(counts[c['key']] * c.get('weight', 0) for c in self.categories)
+
+        patterns = []
+        for penalty in self.penalties:
+            count = counts[penalty['key']]
+            if count > penalty.get('above', 0):
+                deduction = penalty.get('flat', 0) + penalty.get('per_count', 0) * count
+                score = max(0, score - deduction)
+                if penalty.get('label'):
+                    patterns.append(f"{penalty['label']} (count: {count})")
+
+        for category in self.categories:
+            count = counts[category['key']]
+            if count > 0 and category.get('label'):
+                patterns.append(f"{category['label']} (count: {count})")
+
+        return {
+            "score": score,
+            "patterns": patterns,
+            "counts": counts
+        }
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Overlap-aware stitching of scrolled screenshots into continuous transcripts.
+
+Consecutive screenshots of one chat share text: the bottom of one capture
+is the top of the next. Scoring each capture separately counts that text
+twice. Here the OCR lines of neighbouring screenshots are compared with
+polynomial rolling hashes to find the longest suffix of one screen that
+equals a prefix of the next, and the screens are merged without the
+repeated lines. Each neighbour pair costs time linear in its line count,
+so a whole session is stitched in linear time.
+
+Screenshots are ordered by the numbers in their filenames (IMG_0714 before
+IMG_0715); a neighbour that shares no overlap starts a new session.
+"""
+
+import re
+
+# Fewer shared lines than this is treated as coincidence ("Copy", "Retry")
+MIN_OVERLAP_LINES = 2
+
+# Lines at a screen edge are often cut mid-glyph and OCR'd differently;
+# up to this many are allowed to mismatch at each edge
+EDGE_SLACK = 1
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+def natural_key(name):
+    """Sort key that orders embedded numbers numerically (IMG_9 < IMG_10)."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', str(name))]
+
+
+def normalize_line(line):
+    """Normalize an OCR line for comparison: lowercase alphanumerics only."""
+    return ' '.join(re.findall(r'[a-z0-9]+', line.lower()))
+
+
+def screen_lines(text):
+    """
+    Split OCR text into lines for stitching.
+
+    Returns a list of (key, line, starts_paragraph) tuples for non-empty
+    lines; blank lines only mark paragraph boundaries.
+    """
+    lines = []
+    paragraph_break = True
+    for raw in text.splitlines():
+        line = raw.strip()
+        key = normalize_line(line)
+        if not key:
+            paragraph_break = True
+            continue
+        lines.append((key, line, paragraph_break))
+        paragraph_break = False
+    return lines
+
+
+def _line_hashes(lines):
+    return [hash(key) % _MOD for key, _, _ in lines]
+
+
+def find_overlap(previous, current):
+    """
+    Length of the longest suffix of previous that equals a prefix of current.
+
+    Both arguments are lists of line hashes. Returns 0 if the longest match
+    is shorter than MIN_OVERLAP_LINES.
+    """
+    limit = min(len(previous), len(current))
+    n = len(previous)
+    prefix = 0
+    suffix = 0
+    power = 1
+    best = 0
+    for k in range(1, limit + 1):
+        prefix = (prefix * _BASE + current[k - 1]) % _MOD
+        suffix = (previous[n - k] * power + suffix) % _MOD
+        power = (power * _BASE) % _MOD
+        if prefix == suffix and k >= MIN_OVERLAP_LINES:
+            best = k
+
+    # Guard against hash collisions; on a mismatch fall back to a direct scan
+    if best and previous[n - best:] != current[:best]:
+        best = 0
+        for k in range(limit, MIN_OVERLAP_LINES - 1, -1):
+            if previous[n - k:] == current[:k]:
+                best = k
+                break
+    return best
+
+
+def match_screens(previous, current):
+    """
+    Find how two neighbouring screens overlap, tolerating cut edge lines.
+
+    Returns (overlap, trim_previous, skip_current): the merged screen is
+    previous[:len(previous) - trim_previous] + current[skip_current + overlap:].
+    overlap is 0 if the screens do not overlap.
+    """
+    best = (0, 0, 0)
+    for trim in range(EDGE_SLACK + 1):
+        for skip in range(EDGE_SLACK + 1):
+            head = previous[:len(previous) - trim] if trim else previous
+            overlap = find_overlap(head, current[skip:])
+            if overlap > best[0]:
+                best = (overlap, trim, skip)
+        if best[0]:
+            # Prefer keeping previous intact when it already overlaps
+            break
+    return best
+
+
+def stitch_screenshots(screens):
+    """
+    Stitch OCR'd screenshots into sessions of continuous transcript.
+
+    screens is an iterable of (name, text) pairs. Returns a list of session
+    dicts with the contributing image names, the overlap found between each
+    neighbour pair, and the deduplicated lines as (line, starts_paragraph).
+    """
+    sessions = []
+    current = None
+    previous_hashes = None
+
+    for name, text in sorted(screens, key=lambda s: natural_key(s[0])):
+        lines = screen_lines(text)
+        if not lines:
+            continue
+        hashes = _line_hashes(lines)
+
+        if current is not None:
+            overlap, trim, skip = match_screens(previous_hashes, hashes)
+            if overlap:
+                if trim:
+                    del current["lines"][-trim:]
+                current["images"].append(name)
+                current["overlaps"].append(overlap)
+                current["lines"].extend((line, para) for _, line, para in lines[skip + overlap:])
+                previous_hashes = hashes
+                continue
+
+        current = {
+            "images": [name],
+            "overlaps": [],
+            "lines": [(line, para) for _, line, para in lines]
+        }
+        sessions.append(current)
+        previous_hashes = hashes
+
+    return sessions
+
+
+def session_text(session):
+    """Join a session's lines back into text, keeping paragraph breaks."""
+    parts = []
+    for line, starts_paragraph in session["lines"]:
+        if starts_paragraph and parts:
+            parts.append('')
+        parts.append(line)
+    return '\n'.join(parts)
+
+
+def session_to_conversation(session, role_of=None):
+    """
+    Convert a stitched session to the message list TranscriptAnalyzer expects.
+
+    Each paragraph becomes one message. OCR text carries no speaker
+    information, so every message is attributed to the assistant unless a
+    role_of(paragraph) callable is supplied.
+    """
+    paragraphs = []
+    for line, starts_paragraph in session["lines"]:
+        if starts_paragraph or not paragraphs:
+            paragraphs.append([line])
+        else:
+            paragraphs[-1].append(line)
+
+    conversation = []
+    for paragraph in paragraphs:
+        content = ' '.join(paragraph)
+        role = role_of(content) if role_of else 'assistant'
+        conversation.append({'role': role, 'content': content})
+    return conversation
@@ -4,13 +4,29 @@ Portfolio Validation Script
 
 Validates the structure and content of the AI Behavioral Safety Studies portfolio.
 Checks for required files, directory structure, and basic content validity.
+
+Each check's outcome is cached in .validation_cache.json together with the
+content hashes of the files it reads. On the next run a check is only
+re-run if one of its input files changed (or this script did); input files
+are stat'ed and, where needed, read and hashed concurrently. A different
+Python version or a change in which optional dependencies are installed
+invalidates the whole cache.
 """
 
 import os
 import sys
+import ast
 import json
+import time
+import hashlib
+import argparse
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
+
+CACHE_FILENAME = ".validation_cache.json"
 
 class PortfolioValidator:
     """Validate portfolio structure and content."""
@@ -53,11 +69,178 @@ class PortfolioValidator:
         "observations/behavioral-patterns.md": ["Key Patterns Identified", "Safety Implications"]
     }
     
-    def __init__(self, portfolio_path: str):
+    # The benchmark and its recorded budgets; the analyzer and the tool
+    # modules it imports are added by _local_imports
+    PERFORMANCE_INPUTS = [
+        "tools/performance_check.py",
+        "tools/performance_budgets.json"
+    ]
+    
+    # Optional packages the tools behave differently with (checked, not imported)
+    OPTIONAL_DEPENDENCIES = ["pyarrow", "PIL", "pytesseract"]
+    
+    def __init__(self, portfolio_path: str, use_cache: bool = True):
         self.portfolio_path = Path(portfolio_path)
         self.errors = []
         self.warnings = []
         self.successes = []
+        self.use_cache = use_cache
+        self.cache_path = self.portfolio_path / CACHE_FILENAME
+        # Per-check {"seconds", "cached"} from the last run_validation
+        self.timings = {}
+        self._file_cache = {}
+        self._check_cache = {}
+        self._fingerprints = {}
+        self._contents = {}
+    
+    def _validator_digest(self) -> str:
+        """Hash of this script; changing the rules invalidates the cache."""
+        return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    
+    def _environment(self) -> Dict:
+        """Python version and optional dependency availability the outcomes were computed with."""
+        return {
+            "python": ".".join(str(part) for part in sys.version_info[:3]),
+            "optional": {name: importlib.util.find_spec(name) is not None
+                         for name in self.OPTIONAL_DEPENDENCIES}
+        }
+    
+    def _load_cache(self):
+        """Load cached file hashes and check outcomes, if still valid."""
+        if not self.use_cache or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Ignoring unreadable validation cache: {e}")
+            return
+        if cache.get("validator") == self._validator_digest() and cache.get("environment") == self._environment():
+            self._file_cache = cache.get("files", {})
+            self._check_cache = cache.get("checks", {})
+    
+    def _save_cache(self):
+        """Write the cache atomically."""
+        if not self.use_cache or not self.portfolio_path.is_dir():
+            return
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "validator": self._validator_digest(),
+                "environment": self._environment(),
+                "files": self._file_cache,
+                "checks": self._check_cache
+            }, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+    
+    def _fingerprint(self, rel_path: str) -> str:
+        """
+        Content fingerprint of a portfolio path: its SHA-256, "dir" or "missing".
+        
+        Size and mtime are compared with the cache first; a file is only
+        read (and its content kept for the checks) when they differ.
+        """
+        full_path = self.portfolio_path / rel_path
+        try:
+            stat = full_path.stat()
+        except OSError:
+            return "missing"
+        if full_path.is_dir():
+            return "dir"
+        
+        entry = self._file_cache.get(rel_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+        
+        data = full_path.read_bytes()
+        self._contents[rel_path] = data
+        digest = hashlib.sha256(data).hexdigest()
+        self._file_cache[rel_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+    
+    def _prefetch(self, rel_paths: List[str]):
+        """Fingerprint all input files concurrently."""
+        rel_paths = [p for p in dict.fromkeys(rel_paths) if p not in self._fingerprints]
+        if not rel_paths:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(rel_paths))) as executor:
+            for rel_path, fingerprint in zip(rel_paths, executor.map(self._fingerprint, rel_paths)):
+                self._fingerprints[rel_path] = fingerprint
+    
+    def _read_text(self, rel_path: str) -> str:
+        """Read a portfolio file, reusing content already read for hashing."""
+        data = self._contents.pop(rel_path, None)
+        if data is None:
+            data = (self.portfolio_path / rel_path).read_bytes()
+        return data.decode('utf-8')
+    
+    def checks(self) -> List[Tuple[str, List[str], Callable[[], None]]]:
+        """Return (name, input paths, check function) for every check, in report order."""
+        checks = [("structure", self.REQUIRED_DIRECTORIES + self.REQUIRED_FILES, self.validate_structure)]
+        for file_path, required_sections in self.REQUIRED_SECTIONS.items():
+            checks.append((f"content:{file_path}", [file_path],
+                           partial(self._validate_sections, file_path, required_sections)))
+        checks.append(("examples", ["examples/sample_transcript.json"], self.validate_examples))
+        checks.append(("tools", ["tools/transcript_analyzer.py"], self.validate_tools))
+        examples = sorted(
+            str(path.relative_to(self.portfolio_path))
+            for path in (self.portfolio_path / "examples").glob("*.json")
+        )
+        performance_inputs = self.PERFORMANCE_INPUTS + self._local_imports("tools/performance_check.py")
+        checks.append(("performance", performance_inputs + examples, self.validate_performance))
+        return checks
+    
+    def _local_imports(self, rel_path: str) -> List[str]:
+        """
+        Modules next to a script that it imports, directly or through each other.
+        
+        Import statements are read with ast (anywhere in the file, including
+        lazy imports inside functions); nothing is executed.
+        """
+        directory = Path(rel_path).parent
+        found = []
+        pending = [rel_path]
+        while pending:
+            try:
+                tree = ast.parse((self.portfolio_path / pending.pop()).read_text(encoding='utf-8'))
+            except (OSError, SyntaxError, ValueError):
+                continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                    names = [node.module]
+                else:
+                    continue
+                for name in names:
+                    module = (directory / f"{name.split('.')[0]}.py").as_posix()
+                    if module != rel_path and module not in found and (self.portfolio_path / module).is_file():
+                        found.append(module)
+                        pending.append(module)
+        return sorted(found)
+    
+    def _run_check(self, name: str, inputs: List[str], check: Callable[[], None]):
+        """Run a check, or replay its cached outcome if none of its inputs changed."""
+        start = time.perf_counter()
+        fingerprints = {rel_path: self._fingerprints[rel_path] for rel_path in inputs}
+        cached = self._check_cache.get(name) if self.use_cache else None
+        
+        if cached and cached["inputs"] == fingerprints:
+            self.successes.extend(cached["successes"])
+            self.warnings.extend(cached["warnings"])
+            self.errors.extend(cached["errors"])
+        else:
+            marks = (len(self.successes), len(self.warnings), len(self.errors))
+            check()
+            self._check_cache[name] = {
+                "inputs": fingerprints,
+                "successes": self.successes[marks[0]:],
+                "warnings": self.warnings[marks[1]:],
+                "errors": self.errors[marks[2]:]
+            }
+            cached = None
+        
+        self.timings[name] = {"seconds": time.perf_counter() - start, "cached": cached is not None}
     
     def validate_structure(self):
         """Validate directory and file structure."""
@@ -100,35 +283,37 @@ class PortfolioValidator:
     def validate_content(self):
         """Validate content of key files."""
         for file_path, required_sections in self.REQUIRED_SECTIONS.items():
-            full_path = self.portfolio_path / file_path
-            if full_path.exists():
-                try:
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    missing_sections = []
-                    for section in required_sections:
-                        # Look for section headers (markdown format)
-                        if f"# {section}" not in content and f"## {section}" not in content:
-                            # Try with different formatting
-                            if section.lower() not in content.lower():
-                                missing_sections.append(section)
+            self._validate_sections(file_path, required_sections)
+    
+    def _validate_sections(self, file_path: str, required_sections: List[str]):
+        """Check that one file contains its required sections."""
+        full_path = self.portfolio_path / file_path
+        if full_path.exists():
+            try:
+                content = self._read_text(file_path)
+                
+                missing_sections = []
+                for section in required_sections:
+                    # Look for section headers (markdown format)
+                    if f"# {section}" not in content and f"## {section}" not in content:
+                        # Try with different formatting
+                        if section.lower() not in content.lower():
+                            missing_sections.append(section)
+                
+                if missing_sections:
+                    self.warnings.append(f"File {file_path} may be missing sections: {', '.join(missing_sections)}")
+                else:
+                    self.successes.append(f"✓ File {file_path} contains required sections")
                     
-                    if missing_sections:
-                        self.warnings.append(f"File {file_path} may be missing sections: {', '.join(missing_sections)}")
-                    else:
-                        self.successes.append(f"✓ File {file_path} contains required sections")
-                        
-                except Exception as e:
-                    self.errors.append(f"Error reading {file_path}: {e}")
+            except Exception as e:
+                self.errors.append(f"Error reading {file_path}: {e}")
     
     def validate_examples(self):
         """Validate example files."""
         example_path = self.portfolio_path / "examples" / "sample_transcript.json"
         if example_path.exists():
             try:
-                with open(example_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = json.loads(self._read_text("examples/sample_transcript.json"))
                 
                 # Check basic structure
                 if "conversation" not in data:
@@ -155,8 +340,7 @@ class PortfolioValidator:
         tool_path = self.portfolio_path / "tools" / "transcript_analyzer.py"
         if tool_path.exists():
             try:
-                with open(tool_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_text("tools/transcript_analyzer.py")
                 
                 # Check for key components
                 checks = [
@@ -177,12 +361,42 @@ class PortfolioValidator:
             except Exception as e:
                 self.errors.append(f"Error validating tools: {e}")
     
-    def run_validation(self) -> bool:
-        """Run all validation checks."""
-        self.validate_structure()
-        self.validate_content()
-        self.validate_examples()
-        self.validate_tools()
+    def validate_performance(self):
+        """Check analyzer throughput and peak memory against the recorded budgets."""
+        tools_path = self.portfolio_path / "tools"
+        budgets_path = tools_path / "performance_budgets.json"
+        if not budgets_path.exists():
+            self.warnings.append("No performance budgets recorded (run tools/performance_check.py --record)")
+            return
+        
+        try:
+            if str(tools_path) not in sys.path:
+                sys.path.insert(0, str(tools_path))
+            import performance_check
+            
+            config = performance_check.load_config(budgets_path)
+            results = performance_check.run_workloads(self.portfolio_path, config)
+            for status, message in performance_check.compare(results, config):
+                if status == "ok":
+                    self.successes.append(f"✓ Performance within budget: {message}")
+                elif status == "warning":
+                    # Throughput varies with the machine; advisory unless far below budget
+                    self.warnings.append(f"Performance warning: {message}")
+                else:
+                    self.errors.append(f"Performance budget exceeded: {message}")
+        except Exception as e:
+            self.errors.append(f"Error running performance checks: {e}")
+    
+    def run_validation(self, show_timings: bool = False) -> bool:
+        """Run all validation checks, skipping those whose inputs are unchanged."""
+        start = time.perf_counter()
+        self._load_cache()
+        checks = self.checks()
+        self._prefetch([rel_path for _, inputs, _ in checks for rel_path in inputs])
+        for name, inputs, check in checks:
+            self._run_check(name, inputs, check)
+        self._save_cache()
+        total = time.perf_counter() - start
         
         # Summary
         print("\n" + "="*60)
@@ -206,6 +420,15 @@ class PortfolioValidator:
             for error in self.errors:
                 print(f"  ✗ {error}")
         
+        if show_timings:
+            print(f"\nCHECK TIMINGS:")
+            for name, timing in self.timings.items():
+                source = "cached" if timing["cached"] else "ran"
+                print(f"  {timing['seconds'] * 1000:8.2f} ms  {source:<6}  {name}")
+        
+        reused = sum(1 for timing in self.timings.values() if timing["cached"])
+        print(f"\n{len(self.timings)} checks ({reused} unchanged, reused from cache) in {total * 1000:.1f} ms")
+        
         print("\n" + "="*60)
         
         if self.errors:
@@ -220,15 +443,16 @@ class PortfolioValidator:
 
 def main():
     """Main validation function."""
-    # Default to current directory if not specified
-    if len(sys.argv) > 1:
-        portfolio_path = sys.argv[1]
-    else:
-        # Assume script is run from portfolio root
-        portfolio_path = "."
-    
-    validator = PortfolioValidator(portfolio_path)
-    success = validator.run_validation()
+    parser = argparse.ArgumentParser(description='Validate the portfolio structure and content')
+    # Assume script is run from portfolio root
+    parser.add_argument('portfolio_path', nargs='?', default=".", help='Portfolio root (default: .)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Re-run every check and do not read or write {CACHE_FILENAME}')
+    parser.add_argument('--timings', action='store_true', help='Show per-check timings')
+    args = parser.parse_args()
+    
+    validator = PortfolioValidator(args.portfolio_path, use_cache=not args.no_cache)
+    success = validator.run_validation(show_timings=args.timings)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)